@@ -11,11 +11,14 @@ Features to be implemented :
 
 import streamlit as st
 from ui.sidebar import render_sidebar
-from ui.main_ui import render_main_ui, render_preview
+from ui.main_ui import render_main_ui, render_preview, render_performance, render_jobs
 from models.timesheet import initialize_session_state
-from services.excel_service import generate_excel_timesheet
-import pandas as pd
-import io
+from services.holiday_service import get_session_calendar
+from services.job_service import get_session_jobs, add_session_job
+from services.result_service import compute_fingerprint, get_result, collect_job_results, submit_timesheet_job
+from services.speculation_service import speculate, cancel_speculation
+from services.llm_service import start_warm_up
+from config.settings import GENERATION_DEADLINE_SECONDS
 
 # App configuration
 st.set_page_config(page_title="Timesheet Generator", layout="wide")
@@ -24,45 +27,75 @@ st.title("Timesheet Generator")
 # Initialize session state
 initialize_session_state()
 
+# Load the models on the Ollama hosts in the background, once per process
+start_warm_up()
+
 # Render sidebar (settings)
 render_sidebar()
 
 # Render main UI (employee info, date selection, daily descriptions)
 employee_info, date_range, descriptions_text, dates = render_main_ui()
 
-# Generate timesheet when button is clicked
-if st.button("Generate Timesheet", type="primary"):
-    # Show progress
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-    
-    # Generate Excel file and preview data
-    output, preview_data = generate_excel_timesheet(
-        employee_info, 
-        date_range, 
-        descriptions_text, 
-        dates, 
-        progress_bar,
-        status_text
-    )
-    
-    # Update preview
-    preview_df = pd.DataFrame(preview_data)
-    
+# Pick up timesheets generated in the background since the last rerun
+jobs = get_session_jobs()
+collect_job_results(jobs)
+
+# Reuse a timesheet already generated in this session for the same inputs
+holidays = get_session_calendar(st.session_state.holidays).between(*date_range)
+fingerprint = compute_fingerprint(employee_info, date_range, descriptions_text, holidays, st.session_state.work_hours,
+                                  st.session_state.profile_generation)
+result = get_result(fingerprint)
+running = any(job.key == fingerprint and job.active for job in jobs)
+
+# Start summarizing edited descriptions in the background before Generate is clicked
+if result is None and not running:
+    speculate(descriptions_text, dates, holidays, st.session_state.work_hours)
+
+# Queue generation when button is clicked and the inputs changed
+if st.button("Generate Timesheet", type="primary") and result is None and not running:
+    # Speculative calls still in flight are shared with the job; queued ones would only compete with it
+    cancel_speculation()
+    job = submit_timesheet_job(employee_info, date_range, descriptions_text, dates, fingerprint,
+                               st.session_state.profile_generation)
+    add_session_job(job)
+    jobs.append(job)
+    running = True
+
+# Show progress of queued and running jobs, with the live preview of the current one
+render_jobs(jobs, fingerprint if result is None else None)
+
+if result is not None:
     # Display success message and download button
     st.success("Timesheet generated successfully!")
+    if result['late_rows']:
+        st.info(f"{result['late_rows']} day(s) got a quick summary because the LLM did not answer within "
+                f"{GENERATION_DEADLINE_SECONDS} s. An upgraded workbook with full summaries is being "
+                "prepared in the Jobs panel and will replace this one when it is ready.")
+    file_stem = f"timesheet_{employee_info['name'].replace(' ', '_')}_{date_range[0].strftime('%Y%m%d')}-{date_range[1].strftime('%Y%m%d')}"
     st.download_button(
         label="Download Timesheet Excel",
-        data=output,
-        file_name=f"timesheet_{employee_info['name'].replace(' ', '_')}_{date_range[0].strftime('%Y%m%d')}-{date_range[1].strftime('%Y%m%d')}.xlsx",
+        data=result['workbook'],
+        file_name=f"{file_stem}.xlsx",
         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
     )
+    if result['profile']:
+        st.download_button(
+            label="Download Profile (.prof)",
+            data=result['profile'],
+            file_name=f"{file_stem}.prof",
+            mime="application/octet-stream",
+            help="cProfile data of this generation; open with `python -m pstats` or snakeviz"
+        )
     
     # Show preview
-    render_preview(preview_df)
-else:
+    render_preview(result['preview'])
+elif not running:
     # Display empty preview if not generated
-    render_preview(pd.DataFrame())
+    render_preview([])
+
+# Show the timing breakdown of the last generation
+if 'last_run_metrics' in st.session_state:
+    render_performance(st.session_state.last_run_metrics)
 
 # Add footer with version information
 st.markdown("---")
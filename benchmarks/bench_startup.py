@@ -0,0 +1,129 @@
+"""
+Startup benchmark for the Streamlit app.
+
+Usage:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --reruns 20 --output startup.json
+
+Reports the `python -X importtime` breakdown of the modules loaded for the
+first page paint, whether heavy dependencies (pandas, openpyxl, langchain)
+were pulled in, and the wall time of the first script run and of reruns
+measured with Streamlit's AppTest. Each measurement runs in a fresh
+interpreter so module caches do not hide cold-start costs.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules the app imports before the first page paint
+STARTUP_IMPORTS = "import streamlit; import ui.sidebar, ui.main_ui, models.timesheet"
+
+# Dependencies that should only be loaded once a timesheet is generated
+HEAVY_MODULES = ["pandas", "openpyxl", "langchain"]
+
+APP_RUN_SCRIPT = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+start = time.perf_counter()
+at = AppTest.from_file("app.py", default_timeout=120).run()
+first = time.perf_counter() - start
+reruns = []
+for _ in range({reruns}):
+    start = time.perf_counter()
+    at.run()
+    reruns.append(time.perf_counter() - start)
+loaded = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"first_run": first, "reruns": reruns, "loaded": loaded}}))
+"""
+
+def run_python(args):
+    return subprocess.run(
+        [sys.executable] + args,
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+def measure_imports(top):
+    """
+    Measure import times of the startup modules with `python -X importtime`
+
+    Args:
+        top (int): Number of slowest top-level imports to report
+
+    Returns:
+        dict: Total import time, slowest top-level imports and loaded heavy modules
+    """
+    result = run_python(["-X", "importtime", "-c", STARTUP_IMPORTS])
+    imports = []
+    loaded = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        head, cumulative_us, name = line.split("|")
+        loaded.add(name.strip())
+        # Only top-level imports (no indentation) so cumulative times are not double counted
+        if not name[1:].startswith(" "):
+            imports.append({
+                'module': name.strip(),
+                'self_ms': int(head.split(":")[1]) / 1000,
+                'cumulative_ms': int(cumulative_us) / 1000
+            })
+
+    imports.sort(key=lambda item: item['cumulative_ms'], reverse=True)
+    return {
+        'total_ms': round(sum(item['cumulative_ms'] for item in imports), 3),
+        'slowest': imports[:top],
+        'heavy_modules_loaded': [name for name in HEAVY_MODULES if name in loaded]
+    }
+
+def measure_app_runs(reruns):
+    """
+    Time the first script run and subsequent reruns of app.py with AppTest
+
+    Args:
+        reruns (int): Number of reruns to time
+
+    Returns:
+        dict: First run time, rerun percentiles and heavy modules loaded by the app
+    """
+    result = run_python(["-c", APP_RUN_SCRIPT.format(reruns=reruns, heavy=HEAVY_MODULES)])
+    data = json.loads(result.stdout.strip().splitlines()[-1])
+    times = sorted(data['reruns'])
+    return {
+        'first_run_ms': round(data['first_run'] * 1000, 3),
+        'rerun_p50_ms': round(statistics.median(times) * 1000, 3) if times else None,
+        'rerun_p95_ms': round(times[min(len(times) - 1, int(len(times) * 0.95))] * 1000, 3) if times else None,
+        'heavy_modules_loaded': data['loaded']
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark cold start and rerun time of the Streamlit app")
+    parser.add_argument("--reruns", type=int, default=10, help="Number of reruns to time")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to report")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'imports': measure_imports(args.top),
+        'app': measure_app_runs(args.reruns)
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Microbenchmarks for the non-LLM hot paths of the timesheet generator.
+
+Usage:
+    python -m benchmarks.bench_timesheet
+    python -m benchmarks.bench_timesheet --iterations 50 --output bench.json
+
+The LLM is replaced by a deterministic stub so timings only cover parsing,
+classification and workbook rendering. Results are printed (or written) as
+JSON with p50/p95 timings and peak traced memory per benchmark.
+"""
+
+import argparse
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from streamlit import logger as streamlit_logger
+
+# Workloads as (name, start date, number of days, number of employees)
+WORKLOADS = [
+    ("1-day", date(2025, 3, 3), 1, 1),
+    ("1-month", date(2025, 3, 1), 31, 1),
+    ("1-year", date(2025, 1, 1), 365, 1),
+    ("100-employees", date(2025, 3, 1), 31, 100)
+]
+
+EMPLOYEE_INFO = {
+    'name': 'Bench Employee',
+    'designation': 'Software Engineer',
+    'department': 'Engineering',
+    'employee_id': 'BENCH001'
+}
+
+WORK_HOURS = {
+    'start': '7:30 AM',
+    'end': '3:30 PM',
+    'duration': '8 Hrs'
+}
+
+def stub_summarize_task(description, *args, **kwargs):
+    """Deterministic stand-in for the LLM: 'Completed: ' and the first 29 words of the description
+
+    Accepts and ignores summarize_task's other arguments (metrics, streaming
+    callback, latency budget), so the stub keeps matching its signature. The
+    prefix matters: a summary equal to the description is treated as a failed
+    LLM call and replaced by the extractive fallback.
+    """
+    return "Completed: " + " ".join(description.split()[:29])
+
+def install_llm_stub():
+    import services.llm_service as llm_service
+    llm_service.summarize_task = stub_summarize_task
+
+def make_descriptions(dates):
+    """
+    Build a realistic descriptions text with working days, leave and weekends
+    """
+    lines = []
+    for i, day in enumerate(dates):
+        prefix = f"{day.day} {day.strftime('%a')}: "
+        if day.weekday() >= 5:
+            lines.append(prefix + "Weekend")
+        elif i % 17 == 0:
+            lines.append(prefix + "Leave - Personal")
+        else:
+            lines.append(prefix + f"Worked on feature {i} using VSCode and Git, reviewed pull requests and fixed failing tests")
+    return "\n".join(lines)
+
+def measure(func, iterations):
+    """
+    Time a callable and record its peak traced memory
+
+    Returns:
+        dict: Timing percentiles in milliseconds and peak memory in KiB
+    """
+    func()  # Warm up
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+    return {
+        'iterations': iterations,
+        'p50_ms': round(statistics.median(timings), 4),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 4),
+        'mean_ms': round(statistics.fmean(timings), 4),
+        'min_ms': round(timings[0], 4),
+        'peak_memory_kib': round(peak / 1024, 1)
+    }
+
+def build_cases(workload, backend):
+    """
+    Build the benchmark callables for one workload
+
+    Returns:
+        list: (benchmark name, callable) pairs
+    """
+    from services.excel_service import build_timesheet, classify_date, iter_timesheet_rows, render_workbook
+    from services.holiday_service import HolidayCalendar
+    from models.timesheet import Holiday
+    from utils.helpers import generate_date_range, parse_descriptions
+
+    _, start_date, days, employees = workload
+    end_date = start_date + timedelta(days=days - 1)
+    date_range = (start_date, end_date)
+    dates = generate_date_range(start_date, end_date)
+    descriptions_text = make_descriptions(dates)
+    holidays = HolidayCalendar([Holiday(start_date + timedelta(days=d), "Company Holiday") for d in range(0, days, 45)])
+    date_to_desc = parse_descriptions(descriptions_text, dates)
+    holiday_dict = {holiday.date: holiday.name for holiday in holidays.between(start_date, end_date)}
+    rows = list(iter_timesheet_rows(date_range, descriptions_text, dates, holidays, WORK_HOURS))
+
+    def classify():
+        for day in dates:
+            classify_date(day, date_to_desc.get(day, ""), holiday_dict.get(day), WORK_HOURS)
+
+    def render():
+        sheets = [(f"Sheet{n}", EMPLOYEE_INFO, date_range, rows) for n in range(employees)]
+        render_workbook(sheets, io.BytesIO(), backend=backend)
+
+    def end_to_end():
+        for _ in range(employees):
+            build_timesheet(EMPLOYEE_INFO, date_range, descriptions_text, dates, holidays, WORK_HOURS)
+
+    return [
+        ("generate_date_range", lambda: generate_date_range(start_date, end_date)),
+        ("parse_descriptions", lambda: parse_descriptions(descriptions_text, dates)),
+        ("classify_date", classify),
+        ("render_workbook", render),
+        ("build_timesheet", end_to_end)
+    ]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark parsing, classification and workbook rendering")
+    parser.add_argument("--iterations", type=int, default=20, help="Timed iterations per benchmark")
+    parser.add_argument("--backend", default="standard", choices=["standard", "write_only"], help="Excel writer backend")
+    parser.add_argument("--workload", action="append", choices=[w[0] for w in WORKLOADS],
+                        help="Workload to run (may be given several times, default: all)")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    streamlit_logger.set_log_level("error")
+    install_llm_stub()
+
+    results = []
+    for workload in WORKLOADS:
+        if args.workload and workload[0] not in args.workload:
+            continue
+        # Scale iterations down for the heavy workloads so a full run stays quick
+        iterations = max(3, args.iterations // max(1, workload[2] * workload[3] // 31))
+        for name, func in build_cases(workload, args.backend):
+            result = {'benchmark': name, 'workload': workload[0]}
+            result.update(measure(func, iterations))
+            results.append(result)
+            print(f"{workload[0]:>14} {name:<20} p50 {result['p50_ms']:>10.3f} ms  p95 {result['p95_ms']:>10.3f} ms",
+                  file=sys.stderr)
+
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'backend': args.backend,
+        'results': results
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Check that `cli.py --profile` writes a usable profile for every workbook.
+
+Usage:
+    python -m benchmarks.check_cli_profile
+
+Runs the CLI for two employees against the fake Ollama server (see
+benchmarks/fake_ollama.py), once with a workbook per employee and once with
+--combined, and checks that every expected .prof file is non-empty and
+readable with pstats. The CLI runs in this process with its settings pointed
+at the fake server, and its worker processes are forked from it, so this
+check needs a platform that forks (Linux). Prints one line per check and
+exits with status 1 if any of them fails.
+"""
+
+import os
+import pstats
+import sys
+import tempfile
+
+from benchmarks.fake_ollama import start_server
+
+EMPLOYEES = ["E1", "E2"]
+DESCRIPTIONS = "3 Mon: Fixed the login bug\n4 Tue: Reviewed pull requests and updated the docs\n"
+
+def check_profiles(paths):
+    for path in paths:
+        assert os.path.exists(path), f"{os.path.basename(path)} was not written"
+        assert os.path.getsize(path) > 0, f"{os.path.basename(path)} is empty"
+        assert pstats.Stats(path).total_calls > 0, f"{os.path.basename(path)} has no calls"
+
+def run_cli(input_dir, *args):
+    import cli
+    code = cli.main([input_dir, "--start", "2025-03-01", "--end", "2025-03-07", "--profile", "--workers", "2", *args])
+    assert code == 0, f"cli.py exited with {code}"
+
+def check_separate(input_dir, work_dir):
+    output_dir = os.path.join(work_dir, "separate")
+    run_cli(input_dir, "--output-dir", output_dir)
+    workbooks = [name for name in os.listdir(output_dir) if name.endswith(".xlsx")]
+    assert len(workbooks) == len(EMPLOYEES), workbooks
+    check_profiles([os.path.join(output_dir, os.path.splitext(name)[0] + ".prof") for name in workbooks])
+
+def check_combined(input_dir, work_dir):
+    stem = os.path.join(work_dir, "team")
+    run_cli(input_dir, "--combined", stem + ".xlsx")
+    check_profiles([f"{stem}.prof"] + [f"{stem}_{employee}.prof" for employee in EMPLOYEES])
+
+def main():
+    server, url = start_server()
+    work_dir = tempfile.mkdtemp(prefix="check_cli_profile_")
+    input_dir = os.path.join(work_dir, "descriptions")
+    os.makedirs(input_dir)
+    for employee in EMPLOYEES:
+        with open(os.path.join(input_dir, f"{employee}.txt"), "w", encoding="utf-8") as f:
+            f.write(DESCRIPTIONS)
+
+    import config.settings as settings
+    settings.LLM_ENDPOINTS = [url]
+    settings.LLM_WARM_UP = dict(settings.LLM_WARM_UP, enabled=False)
+    settings.SUMMARY_CACHE = dict(settings.SUMMARY_CACHE, directory=os.path.join(work_dir, "cache"))
+
+    checks = [
+        ("profile per workbook", lambda: check_separate(input_dir, work_dir)),
+        ("profiles with --combined", lambda: check_combined(input_dir, work_dir)),
+    ]
+    failed = 0
+    try:
+        for name, check in checks:
+            try:
+                check()
+            except AssertionError as e:
+                failed += 1
+                print(f"FAIL {name}: {e}")
+            else:
+                print(f"ok   {name}")
+    finally:
+        server.shutdown()
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
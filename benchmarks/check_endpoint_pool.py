@@ -0,0 +1,124 @@
+"""
+Check of the endpoint pool's retry and circuit-breaker behaviour.
+
+Usage:
+    python -m benchmarks.check_endpoint_pool
+
+Runs the EndpointPool from services/llm_service.py against fake Ollama
+servers (see benchmarks/fake_ollama.py) that are healthy, always fail, are
+down or are slow, and checks that failed requests are retried on another
+host, that a host's circuit opens after failure_threshold failures in a row,
+that a single trial request closes it again once the cooldown has elapsed,
+and that request_timeout bounds a request. Prints one line per check and
+exits with status 1 if any of them fails.
+"""
+
+import json
+import sys
+import time
+
+from benchmarks.fake_ollama import start_server
+from services.llm_service import EndpointPool
+
+# A port nothing listens on, for a host that is down
+DOWN_URL = "http://127.0.0.1:9"
+
+def generate(pool, prompt="description: Fixed the login bug."):
+    """
+    Send one generate request through the pool and return the streamed text
+
+    Args:
+        pool (EndpointPool): Pool to send the request through
+        prompt (str): Prompt to send
+
+    Returns:
+        str: Concatenated response tokens
+    """
+    lines = pool.post("/api/generate", {"model": "llama3.2", "prompt": prompt})
+    return "".join(json.loads(line).get("response", "") for line in lines if line)
+
+def host_status(pool, url):
+    return next(status for status in pool.status() if status['url'] == url)
+
+def check_retry(healthy_url, failing_server, failing_url):
+    pool = EndpointPool([failing_url, DOWN_URL, healthy_url], failure_threshold=100, max_retries=2)
+    before = failing_server.stats['errors']
+    results = [generate(pool) for _ in range(5)]
+    assert all(result.startswith("Completed:") for result in results), results
+    assert failing_server.stats['errors'] > before, "the failing host was never tried"
+    assert all(status['in_flight'] == 0 for status in pool.status()), pool.status()
+
+def check_circuit_opens(failing_server, failing_url):
+    pool = EndpointPool([failing_url], failure_threshold=2, max_retries=0, cooldown_seconds=60)
+    for _ in range(2):
+        try:
+            generate(pool)
+        except ConnectionError:
+            pass
+        else:
+            raise AssertionError("a request to a failing host succeeded")
+    assert host_status(pool, failing_url)['open'], pool.status()
+    before = failing_server.stats['requests']
+    try:
+        generate(pool)
+    except ConnectionError as e:
+        assert "circuits are open" in str(e), e
+    else:
+        raise AssertionError("a request went through an open circuit")
+    assert failing_server.stats['requests'] == before, "a host with an open circuit was sent a request"
+
+def check_trial_after_cooldown(recovering_server, recovering_url):
+    pool = EndpointPool([recovering_url], failure_threshold=1, max_retries=0, cooldown_seconds=0.3)
+    recovering_server.error_rate = 1.0
+    try:
+        generate(pool)
+    except ConnectionError:
+        pass
+    assert host_status(pool, recovering_url)['open'], pool.status()
+    recovering_server.error_rate = 0.0
+    time.sleep(0.4)
+    assert generate(pool).startswith("Completed:")
+    status = host_status(pool, recovering_url)
+    assert not status['open'] and status['failures'] == 0, status
+
+def check_request_timeout(slow_url):
+    pool = EndpointPool([slow_url], request_timeout=0.5, max_retries=1)
+    start = time.monotonic()
+    try:
+        generate(pool)
+    except (ConnectionError, TimeoutError):
+        pass
+    else:
+        raise AssertionError("a request outlived request_timeout")
+    elapsed = time.monotonic() - start
+    assert elapsed < 1.5, f"the request took {elapsed:.2f} s with a 0.5 s timeout"
+
+def main():
+    healthy, healthy_url = start_server()
+    failing, failing_url = start_server(error_rate=1.0)
+    recovering, recovering_url = start_server()
+    slow, slow_url = start_server(latency=3.0)
+
+    checks = [
+        ("retry on another host", lambda: check_retry(healthy_url, failing, failing_url)),
+        ("circuit opens after repeated failures", lambda: check_circuit_opens(failing, failing_url)),
+        ("trial request after cooldown", lambda: check_trial_after_cooldown(recovering, recovering_url)),
+        ("request timeout", lambda: check_request_timeout(slow_url)),
+    ]
+    failed = 0
+    try:
+        for name, check in checks:
+            try:
+                check()
+            except AssertionError as e:
+                failed += 1
+                print(f"FAIL {name}: {e}")
+            else:
+                print(f"ok   {name}")
+    finally:
+        for server in (healthy, failing, recovering, slow):
+            server.shutdown()
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
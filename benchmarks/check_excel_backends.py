@@ -0,0 +1,101 @@
+"""
+Check that both Excel backends write the same timesheet.
+
+Usage:
+    python -m benchmarks.check_excel_backends
+
+Renders a month with weekends, a holiday, a leave day and regular days through
+the 'standard' and 'write_only' backends, with the LLM replaced by the
+benchmark stub. It then reads both workbooks back and compares every cell's
+value, font, fill, border and alignment. Data rows must keep the workbook
+default font (Calibri 11), as in workbooks from before named styles. Prints
+one line per check and exits with status 1 if any of them fails.
+"""
+
+import io
+import sys
+from datetime import date, timedelta
+
+import openpyxl
+
+from benchmarks.bench_timesheet import EMPLOYEE_INFO, WORK_HOURS, install_llm_stub, make_descriptions
+
+START_DATE = date(2025, 3, 1)
+DAYS = 31
+DATA_FIRST_ROW = 6  # Rows 1-5 are the title, employee information and headers
+
+def cell_format(cell):
+    """Comparable summary of a cell's value and formatting"""
+    font, fill, border, alignment = cell.font, cell.fill, cell.border, cell.alignment
+    return (
+        cell.value,
+        (font.name, font.sz, font.b, font.i),
+        (fill.fill_type, fill.fgColor.rgb),
+        tuple(side.style if side else None for side in (border.left, border.right, border.top, border.bottom)),
+        (alignment.horizontal, alignment.vertical, alignment.wrap_text)
+    )
+
+def render(backend):
+    """
+    Render the check month with one backend and read it back
+
+    Args:
+        backend (str): 'standard' or 'write_only'
+
+    Returns:
+        openpyxl.worksheet.worksheet.Worksheet: The rendered sheet
+    """
+    from services.excel_service import iter_timesheet_rows, render_workbook
+    from services.holiday_service import HolidayCalendar
+    from models.timesheet import Holiday
+    from utils.helpers import generate_date_range
+
+    end_date = START_DATE + timedelta(days=DAYS - 1)
+    dates = generate_date_range(START_DATE, end_date)
+    descriptions_text = make_descriptions(dates)
+    holidays = HolidayCalendar([Holiday(date(2025, 3, 14), "Company Holiday")])
+    rows = iter_timesheet_rows((START_DATE, end_date), descriptions_text, dates, holidays, WORK_HOURS)
+    output = io.BytesIO()
+    render_workbook([("Timesheet", EMPLOYEE_INFO, (START_DATE, end_date), rows)], output, backend=backend)
+    output.seek(0)
+    return openpyxl.load_workbook(output)["Timesheet"]
+
+def check_same_cells(standard, write_only):
+    assert standard.max_row == write_only.max_row, (standard.max_row, write_only.max_row)
+    for standard_row, write_only_row in zip(standard.iter_rows(), write_only.iter_rows()):
+        for standard_cell, write_only_cell in zip(standard_row, write_only_row):
+            assert cell_format(standard_cell) == cell_format(write_only_cell), \
+                (standard_cell.coordinate, cell_format(standard_cell), cell_format(write_only_cell))
+    assert sorted(map(str, standard.merged_cells.ranges)) == sorted(map(str, write_only.merged_cells.ranges))
+
+def check_data_fonts(sheet):
+    statuses = set()
+    for row in sheet.iter_rows(min_row=DATA_FIRST_ROW, max_row=DATA_FIRST_ROW + DAYS - 1):
+        statuses.add(row[2].value.split(" - ")[0])
+        for cell in row:
+            assert (cell.font.name, cell.font.sz) == ("Calibri", 11.0), \
+                (cell.coordinate, cell.font.name, cell.font.sz)
+    assert {"Weekend", "Holiday", "Leave"} <= statuses, statuses
+
+def main():
+    install_llm_stub()
+    sheets = {backend: render(backend) for backend in ("standard", "write_only")}
+
+    checks = [
+        ("backends write the same cells", lambda: check_same_cells(sheets["standard"], sheets["write_only"])),
+        ("standard data rows use Calibri 11", lambda: check_data_fonts(sheets["standard"])),
+        ("write_only data rows use Calibri 11", lambda: check_data_fonts(sheets["write_only"])),
+    ]
+    failed = 0
+    for name, check in checks:
+        try:
+            check()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL {name}: {e}")
+        else:
+            print(f"ok   {name}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
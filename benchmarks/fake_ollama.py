@@ -0,0 +1,214 @@
+"""
+Fake Ollama HTTP server for exercising the LLM client without a model.
+
+Usage:
+    python -m benchmarks.fake_ollama --port 11500 --latency 0.2 --error-rate 0.1
+
+Then point LLM_ENDPOINTS in config/settings.py at http://localhost:11500.
+/api/generate streams a shortened copy of the task description(s) in the
+prompt, prefixed with "Completed:", back as NDJSON chunks like Ollama does, after an optional latency
+with jitter; a fraction of requests fail with HTTP 500. HTTP/1.1 keep-alive
+is supported, and the number of requests and connections served is tracked
+on the server object.
+
+To exercise warm-up and output-length controls, the first request for a model
+that is not loaded waits --load-time seconds (a request without a prompt only
+loads the model, which stays loaded for the request's keep_alive), responses
+can ramble on for --ramble-words extra words, and the num_predict and stop
+options cut the response short like Ollama does.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Numbered description lines of a batch prompt and the description in a single-task prompt
+BATCH_LINE = re.compile(r"^(\d+)\.\s+(.+)$", re.MULTILINE)
+SINGLE_DESCRIPTION = re.compile(r"description:\s*(.+?)\.\s*$", re.MULTILINE)
+# Notes in the prompt for one chunk of a long description
+CHUNK_NOTES = re.compile(r"work notes for a daily work report:\n\n(.+?)\n\nSummarize this part", re.DOTALL)
+DURATION = re.compile(r"^(\d+(?:\.\d+)?)([smh]?)$")
+
+def keep_alive_seconds(value, default=300):
+    """Seconds a keep_alive value ('30m', '1h', 90, -1) keeps a model loaded; None means forever"""
+    if value is None:
+        return default
+    if isinstance(value, (int, float)):
+        return None if value < 0 else value
+    match = DURATION.match(str(value).strip())
+    if not match:
+        return None if str(value).strip().startswith("-") else default
+    return float(match.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+
+def fake_summary(prompt, max_words):
+    """Deterministic stand-in for a model response: 'Completed: ' and the description(s) cut to max_words (chunk notes are cut without the prefix)"""
+    chunk = CHUNK_NOTES.search(prompt)
+    if chunk:
+        return " ".join(chunk.group(1).split()[:max_words]) + "."
+    numbered = BATCH_LINE.findall(prompt)
+    if numbered:
+        return "\n".join(f"{n}. Completed: " + " ".join(text.split()[:max_words - 1]) for n, text in numbered)
+    match = SINGLE_DESCRIPTION.search(prompt)
+    text = match.group(1) if match else prompt
+    return "Completed: " + " ".join(text.split()[:max_words - 1])
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.stats_lock:
+            self.server.stats['connections'] += 1
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+    def _send(self, status, body, content_type="application/json"):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _write_chunk(self, obj):
+        data = (json.dumps(obj) + "\n").encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self._send(200, json.dumps({"models": [{"name": self.server.model}]}))
+        else:
+            self._send(200, "Ollama is running", "text/plain")
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with server.stats_lock:
+            server.stats['requests'] += 1
+
+        if self.path != "/api/generate":
+            self._send(404, json.dumps({"error": "not found"}))
+            return
+        request = json.loads(body or b"{}")
+        self._load_model(request.get("model"), request.get("keep_alive"))
+        if not request.get("prompt"):
+            self._send(200, json.dumps({"model": request.get("model"), "response": "", "done": True, "done_reason": "load"}))
+            return
+
+        time.sleep(max(0.0, server.latency + random.uniform(-server.jitter, server.jitter)))
+        if random.random() < server.error_rate:
+            with server.stats_lock:
+                server.stats['errors'] += 1
+            self._send(500, json.dumps({"error": "injected failure"}))
+            return
+
+        prompt = request.get("prompt") or ""
+        response = fake_summary(prompt, server.max_words)
+        if server.ramble_words:
+            response += " " + " ".join(["and", "then", "also"][i % 3] for i in range(server.ramble_words))
+        options = request.get("options") or {}
+        for stop in options.get("stop") or []:
+            response = response.split(stop)[0]
+        tokens = re.findall(r"\s*\S+", response)
+        if options.get("num_predict"):
+            tokens = tokens[:options["num_predict"]]
+        eval_stats = {"prompt_eval_count": len(prompt.split()), "eval_count": len(tokens)}
+        # Stand-in token ids: the request's context extended by this prompt and response
+        context = (request.get("context") or []) + list(range(len(prompt.split()) + len(tokens)))
+
+        if request.get("stream") is False:
+            self._send(200, json.dumps({"response": response, "done": True, "context": context, **eval_stats}))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for token in tokens:
+                if server.token_delay:
+                    time.sleep(server.token_delay)
+                self._write_chunk({"response": token, "done": False})
+            self._write_chunk({"response": "", "done": True, "context": context, **eval_stats})
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # Client went away mid-stream, e.g. a cancelled job
+
+    def _load_model(self, model, keep_alive):
+        # Wait the load time unless the model is still resident, then keep it for keep_alive
+        server = self.server
+        with server.stats_lock:
+            expires = server.loaded.get(model, 0.0)
+            loaded = expires is None or expires > time.monotonic()
+        if not loaded and server.load_time:
+            time.sleep(server.load_time)
+            with server.stats_lock:
+                server.stats['loads'] += 1
+        seconds = keep_alive_seconds(keep_alive)
+        with server.stats_lock:
+            server.loaded[model] = None if seconds is None else time.monotonic() + seconds
+
+def start_server(port=0, latency=0.0, jitter=0.0, error_rate=0.0, token_delay=0.0, max_words=30, model="llama3.2",
+                 load_time=0.0, ramble_words=0):
+    """
+    Start a fake Ollama server on a background thread
+
+    Args:
+        port (int): Port to listen on (0 picks a free port)
+        latency (float): Seconds to wait before answering each request
+        jitter (float): Maximum random seconds added to or removed from the latency
+        error_rate (float): Fraction of requests answered with HTTP 500
+        token_delay (float): Seconds between streamed tokens
+        max_words (int): Maximum number of words in each response
+        model (str): Model name reported by /api/tags
+        load_time (float): Seconds the first request for a model that is not loaded waits
+        ramble_words (int): Extra words appended to every response before num_predict and stop apply
+
+    Returns:
+        tuple: (server, base URL); call server.shutdown() to stop it
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakeOllamaHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.jitter = jitter
+    server.error_rate = error_rate
+    server.token_delay = token_delay
+    server.max_words = max_words
+    server.model = model
+    server.load_time = load_time
+    server.ramble_words = ramble_words
+    server.loaded = {}  # Model -> time.monotonic() its keep_alive expires (None: never)
+    server.stats = {'requests': 0, 'connections': 0, 'errors': 0, 'loads': 0}
+    server.stats_lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a fake Ollama server")
+    parser.add_argument("--port", type=int, default=11500, help="Port to listen on")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before each response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random +/- seconds added to the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with HTTP 500")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="Seconds between streamed tokens")
+    parser.add_argument("--load-time", type=float, default=0.0, help="Seconds to load a model that is not resident")
+    parser.add_argument("--ramble-words", type=int, default=0, help="Extra words appended to every response")
+    args = parser.parse_args(argv)
+
+    server, url = start_server(args.port, args.latency, args.jitter, args.error_rate, args.token_delay,
+                               load_time=args.load_time, ramble_words=args.ramble_words)
+    print(f"Fake Ollama listening on {url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Multi-session load test of the Streamlit app against a fake Ollama server.
+
+Usage:
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --concurrency 1 4 16 --days 31 --latency 0.5 --jitter 0.2 --error-rate 0.05
+
+For each concurrency level N, N simulated sessions are started together and
+each goes through the real UI flow with Streamlit's AppTest: load the page,
+pick the date range, type a description for every weekday, click "Generate
+Timesheet" and poll until the workbook can be downloaded. The fake Ollama
+server (benchmarks.fake_ollama) runs in a subprocess with the given latency,
+jitter and error rate, so the memory figures only cover the app.
+
+AppTest is not thread-safe, so script runs of the sessions are interleaved
+on one thread. Generation itself runs in the app's background jobs, shared
+LLM scheduler and endpoint pool, which all sessions in this process share
+exactly as they would in one deployment.
+
+Reports throughput, p50/p99 end-to-end latency (page load to download) and
+resident memory per concurrency level as JSON.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from datetime import date, datetime, timedelta
+from streamlit.testing.v1 import AppTest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TASKS = [
+    "Reviewed pull requests for the payment service and fixed failing integration tests",
+    "Met with the design team to plan the onboarding flow, then updated the API documentation",
+    "Investigated slow database queries in the reporting module and added missing indexes",
+    "Paired with a new team member on the deployment pipeline and wrote runbook notes"
+]
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_fake_ollama(latency, jitter, error_rate, token_delay):
+    """
+    Start benchmarks.fake_ollama in a subprocess and wait until it answers
+
+    Returns:
+        tuple: (process, base URL)
+    """
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.fake_ollama", "--port", str(port), "--latency", str(latency),
+         "--jitter", str(jitter), "--error-rate", str(error_rate), "--token-delay", str(token_delay)],
+        cwd=REPO_ROOT,
+        stdout=subprocess.DEVNULL
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(url, timeout=1).close()
+            return process, url
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("Fake Ollama server did not start")
+
+def rss_mb():
+    """Current resident memory of this process in MB (peak memory where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        import resource  # Unix only
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+class MemorySampler:
+    """Samples resident memory on a background thread and keeps the peak"""
+
+    def __init__(self, interval=0.1):
+        self.interval = interval
+        self.peak = rss_mb()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, rss_mb())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+def descriptions_for(dates, tag):
+    """Text area input with a description on every weekday, made unique by tag so no summary is cached"""
+    lines = []
+    for i, day in enumerate(dates):
+        if day.weekday() < 5:
+            lines.append(f"{day.day} {day.strftime('%a')}: {TASKS[i % len(TASKS)]} ({tag})")
+    return "\n".join(lines)
+
+class SimulatedSession:
+    """One browser session going through the generate-and-download flow, one step per call to step()"""
+
+    def __init__(self, tag, date_range, timeout):
+        self.tag = tag
+        self.date_range = date_range
+        self.timeout = timeout
+        self.app = None
+        self.state = "load"
+        self.started = None
+        self.latency = None
+        self.workbook_bytes = 0
+        self.error = None
+
+    @property
+    def finished(self):
+        return self.state in ("done", "failed")
+
+    def step(self):
+        """Advance the session by one script run"""
+        if self.state == "load":
+            self.started = time.perf_counter()
+            self.app = AppTest.from_file(os.path.join(REPO_ROOT, "app.py"), default_timeout=self.timeout).run()
+            self.app.date_input[0].set_value(self.date_range).run()
+            self.state = "generate"
+        elif self.state == "generate":
+            start, end = self.date_range
+            dates = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+            self.app.text_area[0].set_value(descriptions_for(dates, self.tag))
+            [button for button in self.app.button if button.label == "Generate Timesheet"][0].click()
+            self.app.run()
+            self.state = "wait"
+        else:
+            self.app.run()
+
+        if self.app.exception:
+            self._fail(self.app.exception[0].message)
+        elif self.state == "wait" and self.app.success:
+            # The download button is rendered with the stored workbook; fetch it like a download would
+            result = next(reversed(self.app.session_state.results.values()))
+            self.workbook_bytes = len(result['workbook'])
+            self.latency = time.perf_counter() - self.started
+            self.state = "done"
+        elif self.state == "wait" and any("Failed" in e.value for e in self.app.get("markdown")):
+            self._fail("Generation job failed")
+        elif time.perf_counter() - self.started > self.timeout:
+            self._fail("Timed out")
+
+    def _fail(self, error):
+        self.error = error
+        self.state = "failed"
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def run_level(name, concurrency, date_range, poll_interval, timeout):
+    """
+    Run one concurrency level: start that many sessions together and drive them to completion
+
+    Args:
+        name (str): Level name, making the sessions' descriptions unique
+        concurrency (int): Number of sessions
+        date_range (tuple): Start and end date of each session's timesheet
+        poll_interval (float): Seconds between reruns while every session waits for its job
+        timeout (float): Seconds before a session is counted as failed
+
+    Returns:
+        dict: Throughput, latency percentiles, failures and memory for the level
+    """
+    sessions = [SimulatedSession(f"{name}-s{i}", date_range, timeout) for i in range(concurrency)]
+    memory_before = rss_mb()
+    start = time.perf_counter()
+    with MemorySampler() as sampler:
+        while not all(session.finished for session in sessions):
+            for session in sessions:
+                if not session.finished:
+                    session.step()
+            if all(session.state == "wait" or session.finished for session in sessions):
+                time.sleep(poll_interval)
+    wall = time.perf_counter() - start
+
+    latencies = [session.latency for session in sessions if session.state == "done"]
+    return {
+        'concurrency': concurrency,
+        'completed': len(latencies),
+        'failed': len(sessions) - len(latencies),
+        'errors': sorted({session.error for session in sessions if session.error}),
+        'wall_seconds': round(wall, 3),
+        'throughput_per_minute': round(len(latencies) / wall * 60, 3),
+        'latency_p50_s': round(statistics.median(latencies), 3) if latencies else None,
+        'latency_p99_s': round(percentile(latencies, 0.99), 3) if latencies else None,
+        'workbook_bytes': max((session.workbook_bytes for session in sessions), default=0),
+        'rss_before_mb': round(memory_before, 1),
+        'rss_peak_mb': round(sampler.peak, 1),
+        'rss_after_mb': round(rss_mb(), 1)
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the Streamlit app with simulated sessions and a fake Ollama")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8], help="Concurrency levels to run")
+    parser.add_argument("--days", type=int, default=7, help="Days in each session's timesheet")
+    parser.add_argument("--latency", type=float, default=0.3, help="Fake Ollama seconds before each response")
+    parser.add_argument("--jitter", type=float, default=0.1, help="Fake Ollama random +/- seconds added to the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of fake Ollama requests failing with HTTP 500")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="Fake Ollama seconds between streamed tokens")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="Seconds between reruns while waiting for a job")
+    parser.add_argument("--timeout", type=float, default=300, help="Seconds before a session is counted as failed")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    # Background jobs touch cached resources outside a script run, which Streamlit warns about on every call
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").disabled = True
+    process, url = start_fake_ollama(args.latency, args.jitter, args.error_rate, args.token_delay)
+    try:
+        # Point the app at the fake server and an empty summary cache before any app module is imported
+        import config.settings as settings
+        settings.LLM_ENDPOINTS = [url]
+        settings.SUMMARY_CACHE = dict(settings.SUMMARY_CACHE, directory=tempfile.mkdtemp(prefix="load_test_cache_"))
+
+        date_range = (date(2025, 3, 1), date(2025, 3, 1) + timedelta(days=args.days - 1))
+        # Unreported warm-up so the first level does not pay for importing the app's dependencies
+        run_level("warmup", 1, date_range, args.poll_interval, args.timeout)
+        levels = []
+        for concurrency in args.concurrency:
+            level = run_level(f"c{concurrency}", concurrency, date_range, args.poll_interval, args.timeout)
+            levels.append(level)
+            print(f"{concurrency:>4} sessions  {level['throughput_per_minute']:>8.1f}/min  "
+                  f"p50 {level['latency_p50_s']} s  p99 {level['latency_p99_s']} s  "
+                  f"peak {level['rss_peak_mb']} MB  failed {level['failed']}", file=sys.stderr)
+    finally:
+        process.terminate()
+        process.wait()
+
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'settings': {
+            'days': args.days,
+            'latency': args.latency,
+            'jitter': args.jitter,
+            'error_rate': args.error_rate,
+            'token_delay': args.token_delay,
+            'job_workers': settings.JOB_SETTINGS['workers'],
+            'llm_global_concurrency': settings.LLM_GLOBAL_CONCURRENCY
+        },
+        'levels': levels
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
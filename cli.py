@@ -0,0 +1,308 @@
+"""
+Command line entry point for generating timesheets in bulk without Streamlit.
+
+Usage:
+    python cli.py descriptions/ --start 2025-03-01 --end 2025-03-31 --output-dir out
+    python cli.py manifest.json --start 2025-03-01 --end 2025-03-31 --workers 8
+
+The input is either a directory of description files (one '<employee_id>.txt'
+per employee, using the same 'day day_name: description' format as the app) or
+a JSON manifest listing employees:
+
+    [
+        {
+            "name": "Rahul R",
+            "designation": "Software Engineer",
+            "department": "Engineering",
+            "employee_id": "EMP123",
+            "descriptions": "descriptions/EMP123.txt"
+        }
+    ]
+
+Description paths in a manifest are resolved relative to the manifest file.
+With --combined, all employees are streamed into one workbook with a sheet
+per employee instead of one workbook each. With --profile, a cProfile .prof
+file is written next to each workbook.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from config.settings import DEFAULT_WORK_HOURS, HOLIDAY_CALENDAR_DIR
+
+def load_employees(input_path):
+    """
+    Load employee entries from a manifest file or a directory of description files
+
+    Args:
+        input_path (str): Path to a JSON manifest or a directory of .txt files
+
+    Returns:
+        list: Employee dictionaries with employee info and a 'descriptions' file path
+    """
+    if os.path.isdir(input_path):
+        employees = []
+        for file_name in sorted(os.listdir(input_path)):
+            stem, ext = os.path.splitext(file_name)
+            if ext.lower() != ".txt":
+                continue
+            employees.append({
+                'name': stem.replace('_', ' '),
+                'designation': '',
+                'department': '',
+                'employee_id': stem,
+                'descriptions': os.path.join(input_path, file_name)
+            })
+        return employees
+
+    with open(input_path, encoding="utf-8") as f:
+        entries = json.load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(input_path))
+    employees = []
+    for entry in entries:
+        employees.append({
+            'name': entry['name'],
+            'designation': entry.get('designation', ''),
+            'department': entry.get('department', ''),
+            'employee_id': entry.get('employee_id', ''),
+            'descriptions': os.path.join(base_dir, entry['descriptions'])
+        })
+    return employees
+
+def load_holidays(holiday_paths, calendar_dir=HOLIDAY_CALENDAR_DIR):
+    """
+    Load the organization calendar with any extra ICS/CSV holiday files layered on top
+
+    Args:
+        holiday_paths (list): Paths of extra calendar files
+        calendar_dir (str): Directory of organization calendar files
+
+    Returns:
+        HolidayCalendar: Holidays to mark on every timesheet
+    """
+    from services.holiday_service import load_holiday_files
+
+    paths = []
+    if os.path.isdir(calendar_dir):
+        paths.extend(os.path.join(calendar_dir, file_name) for file_name in sorted(os.listdir(calendar_dir)))
+    paths.extend(holiday_paths)
+    return load_holiday_files(paths)
+
+def render_employee(employee, date_range, holidays, work_hours, output_dir, profile=False):
+    """
+    Render the timesheet for a single employee and write it to disk
+
+    Args:
+        employee (dict): Employee entry from load_employees
+        date_range (tuple): Tuple containing start_date and end_date
+        holidays (HolidayCalendar): Holidays to mark on the timesheet
+        work_hours (dict): Work hours dictionary
+        output_dir (str): Directory to write the workbook to
+        profile (bool): Profile the generation and write '<workbook name>.prof' next to it
+
+    Returns:
+        str: Path of the written workbook
+    """
+    # Imported here so worker processes load the heavy modules themselves
+    from services.excel_service import build_timesheet
+    from services.metrics_service import RunMetrics
+    from services.profiling_service import GenerationProfiler
+    from utils.helpers import generate_date_range
+
+    start_date, end_date = date_range
+    with open(employee['descriptions'], encoding="utf-8") as f:
+        descriptions_text = f.read()
+
+    employee_info = {key: employee[key] for key in ('name', 'designation', 'department', 'employee_id')}
+    dates = generate_date_range(start_date, end_date)
+    metrics = RunMetrics()
+    profiler = GenerationProfiler() if profile else None
+    with profiler.profile() if profiler else nullcontext():
+        output, _ = build_timesheet(employee_info, date_range, descriptions_text, dates, holidays, work_hours,
+                                    metrics=metrics)
+
+    file_name = f"timesheet_{employee_info['name'].replace(' ', '_')}_{start_date.strftime('%Y%m%d')}-{end_date.strftime('%Y%m%d')}.xlsx"
+    output_path = os.path.join(output_dir, file_name)
+    if profiler:
+        profiler.save(os.path.splitext(output_path)[0] + ".prof")
+    with metrics.stage("write"):
+        with open(output_path, "wb") as f:
+            f.write(output.getbuffer())
+    metrics.finish(employee_id=employee_info['employee_id'])
+    return output_path
+
+def collect_employee_rows(employee, date_range, holidays, work_hours, profile_path=None):
+    """
+    Build the timesheet rows for a single employee without rendering a workbook
+
+    Args:
+        employee (dict): Employee entry from load_employees
+        date_range (tuple): Tuple containing start_date and end_date
+        holidays (HolidayCalendar): Holidays to mark on the timesheet
+        work_hours (dict): Work hours dictionary
+        profile_path (str, optional): Profile building the rows and write the .prof file here
+
+    Returns:
+        list: (list of cell values, row style key) tuples in date order
+    """
+    from services.excel_service import iter_timesheet_rows
+    from services.metrics_service import RunMetrics
+    from services.profiling_service import GenerationProfiler
+    from utils.helpers import generate_date_range
+
+    with open(employee['descriptions'], encoding="utf-8") as f:
+        descriptions_text = f.read()
+    dates = generate_date_range(*date_range)
+    metrics = RunMetrics()
+    profiler = GenerationProfiler() if profile_path else None
+    with profiler.profile() if profiler else nullcontext():
+        rows = list(iter_timesheet_rows(date_range, descriptions_text, dates, holidays, work_hours, metrics=metrics))
+    if profiler:
+        profiler.save(profile_path)
+    metrics.finish(employee_id=employee['employee_id'])
+    return rows
+
+def sheet_title(employee, used_titles):
+    """
+    Build a unique worksheet title (at most 31 characters) for an employee
+    """
+    base = "".join(c for c in (employee['employee_id'] or employee['name']) if c not in '[]:*?/\\')[:31] or "Timesheet"
+    title = base
+    suffix = 1
+    while title in used_titles:
+        suffix += 1
+        title = f"{base[:31 - len(str(suffix)) - 1]}_{suffix}"
+    used_titles.add(title)
+    return title
+
+def write_combined(executor, employees, date_range, holidays, work_hours, output_path, profile=False):
+    """
+    Stream every employee into one multi-sheet workbook as their rows complete
+
+    With profile, building each employee's rows is profiled to
+    '<workbook name>_<employee id>.prof' and rendering the workbook to '<workbook name>.prof'.
+
+    Returns:
+        int: Number of employees that failed
+    """
+    from services.excel_service import render_workbook
+    from services.profiling_service import GenerationProfiler
+
+    stem = os.path.splitext(output_path)[0]
+
+    failures = 0
+    used_titles = set()
+
+    # Submitted before profiling starts: the pool forks its workers on submit, and a worker
+    # forked inside profiler.profile() would inherit it and skip profiling its own rows
+    futures = {
+        executor.submit(collect_employee_rows, employee, date_range, holidays, work_hours,
+                        profile_file_name(stem, employee) if profile else None): employee
+        for employee in employees
+    }
+
+    def sheets():
+        nonlocal failures
+        for future in as_completed(futures):
+            employee = futures[future]
+            try:
+                rows = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"Failed to generate timesheet for {employee['name']}: {e}", file=sys.stderr)
+                continue
+            employee_info = {key: employee[key] for key in ('name', 'designation', 'department', 'employee_id')}
+            yield sheet_title(employee, used_titles), employee_info, date_range, rows
+
+    profiler = GenerationProfiler() if profile else None
+    with profiler.profile() if profiler else nullcontext():
+        render_workbook(sheets(), output_path, backend="write_only")
+    if profiler:
+        profiler.save(f"{stem}.prof")
+    print(f"Wrote {output_path}")
+    return failures
+
+def profile_file_name(stem, employee):
+    """
+    Build the .prof path for one employee of a combined workbook
+    """
+    name = "".join(c if c.isalnum() or c in "-_" else "_" for c in (employee['employee_id'] or employee['name']))
+    return f"{stem}_{name}.prof"
+
+def configure_logging(log_metrics):
+    """
+    Configure logging in the main and worker processes
+
+    Args:
+        log_metrics (bool): Emit one JSON metrics line per employee to stderr
+    """
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    if log_metrics:
+        logging.getLogger("timesheet.metrics").setLevel(logging.INFO)
+
+def parse_date(value):
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate timesheets for many employees in parallel")
+    parser.add_argument("input", help="JSON manifest or directory of '<employee_id>.txt' description files")
+    parser.add_argument("--start", required=True, type=parse_date, help="Start date (YYYY-MM-DD)")
+    parser.add_argument("--end", required=True, type=parse_date, help="End date (YYYY-MM-DD)")
+    parser.add_argument("--output-dir", default="timesheets", help="Directory to write workbooks to")
+    parser.add_argument("--holidays", action="append", default=[], metavar="FILE",
+                        help="Extra .ics/.csv holiday calendar (may be given several times)")
+    parser.add_argument("--calendar-dir", default=HOLIDAY_CALENDAR_DIR, help="Directory of organization holiday calendars")
+    parser.add_argument("--work-start", default=DEFAULT_WORK_HOURS['start'])
+    parser.add_argument("--work-end", default=DEFAULT_WORK_HOURS['end'])
+    parser.add_argument("--work-duration", default=DEFAULT_WORK_HOURS['duration'])
+    parser.add_argument("--combined", metavar="PATH", help="Write all employees to one multi-sheet workbook")
+    parser.add_argument("--log-metrics", action="store_true", help="Log per-employee timing metrics as JSON lines")
+    parser.add_argument("--profile", action="store_true", help="Write a cProfile .prof file next to each workbook")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Number of worker processes")
+    args = parser.parse_args(argv)
+
+    if args.start > args.end:
+        parser.error("End date must be after start date")
+
+    employees = load_employees(args.input)
+    holidays = load_holidays(args.holidays, args.calendar_dir)
+    work_hours = {
+        'start': args.work_start,
+        'end': args.work_end,
+        'duration': args.work_duration
+    }
+    configure_logging(args.log_metrics)
+    failures = 0
+    with ProcessPoolExecutor(max_workers=max(1, args.workers), initializer=configure_logging,
+                             initargs=(args.log_metrics,)) as executor:
+        if args.combined:
+            failures = write_combined(executor, employees, (args.start, args.end), holidays, work_hours, args.combined,
+                                      args.profile)
+            print(f"Generated {len(employees) - failures}/{len(employees)} timesheets")
+            return 1 if failures else 0
+
+        os.makedirs(args.output_dir, exist_ok=True)
+        futures = {
+            executor.submit(render_employee, employee, (args.start, args.end), holidays, work_hours, args.output_dir,
+                            args.profile): employee
+            for employee in employees
+        }
+        for future in as_completed(futures):
+            employee = futures[future]
+            try:
+                print(f"Wrote {future.result()}")
+            except Exception as e:
+                failures += 1
+                print(f"Failed to generate timesheet for {employee['name']}: {e}", file=sys.stderr)
+
+    print(f"Generated {len(employees) - failures}/{len(employees)} timesheets")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,7 @@
 # Default application settings
 
+import os
+
 # Default work hours
 DEFAULT_WORK_HOURS = {
     'start': '7:30 AM',
@@ -15,9 +17,124 @@ DEFAULT_EMPLOYEE_INFO = {
     'employee_id': 'EMP123'
 }
 
-# LLM model name
+# Directory of organization holiday calendars (.ics or .csv files with 'date,name' columns)
+HOLIDAY_CALENDAR_DIR = 'calendars'
+
+# LLM model name, used for contextual summaries and as the default routed model
 LLM_MODEL = "llama3.2"
 
+# Local models to route task summaries between, fastest first. A description goes to the first
+# model whose 'max_words' covers its length ('max_words': None covers any length), e.g.
+# [{'name': 'llama3.2:1b', 'max_words': 25}, {'name': 'llama3.2', 'max_words': None}]
+LLM_MODELS = [
+    {'name': LLM_MODEL, 'max_words': None}
+]
+
+# Seconds a generation's LLM calls should take in total (None disables). Each call gets an equal
+# share, and a model whose observed latency exceeds that share is passed over for a faster one
+LLM_LATENCY_TARGET = 60
+
+# Model loading and output length: how long Ollama keeps a model in memory after its last request
+# ('keep_alive', a duration such as '30m', or -1 to never unload), the most tokens generated per
+# summary ('max_tokens'), sequences that end a summary ('stop'), and whether a summary is cut off
+# as soon as it passes SUMMARY_MAX_WORDS ('stop_at_word_limit')
+LLM_GENERATION = {
+    'keep_alive': '30m',
+    'max_tokens': 96,
+    'stop': ['\n\n'],
+    'stop_at_word_limit': True
+}
+
+# Load the models on every Ollama host when the app starts, and again every 'interval_seconds'
+# within 'working_hours' (start and end hour), so first summaries do not wait for a model load
+LLM_WARM_UP = {
+    'enabled': True,
+    'working_hours': (8, 19),
+    'interval_seconds': 900
+}
+
+# Maximum number of summarization requests in flight at once
+LLM_MAX_CONCURRENCY = 4
+
+# Maximum number of LLM calls in flight at once across all sessions; further calls
+# wait in a queue that takes turns between sessions
+LLM_GLOBAL_CONCURRENCY = 4
+
+# Ollama hosts to spread summarization requests across; each request goes to the least-loaded healthy host
+LLM_ENDPOINTS = ["http://localhost:11434"]
+
+# Timeouts, retries and circuit breaking for requests to the Ollama hosts
+LLM_REQUEST_POLICY = {
+    'connect_timeout': 5,      # Seconds to establish a connection
+    'request_timeout': 120,    # Total seconds allowed per summarization, including retries
+    'max_retries': 2,          # Extra attempts on another host after a connection error or 5xx response
+    'failure_threshold': 3,    # Consecutive failures before a host's circuit opens
+    'cooldown_seconds': 30     # Seconds a host is skipped before a trial request is let through
+}
+
+# Number of descriptions packed into a single LLM call (1 disables batching)
+LLM_BATCH_SIZE = 1
+
+# Descriptions over 'threshold_tokens' (counted locally) are split into chunks of at most 'chunk_tokens'
+# that are summarized concurrently, and the day's summary is written from the chunk summaries
+LLM_CHUNKING = {
+    'threshold_tokens': 1000,
+    'chunk_tokens': 500
+}
+
+# Stream summaries token by token into the preview while a timesheet is generated
+LLM_STREAMING = True
+
+# Summarize working days in order, carrying earlier days forward as context for vague descriptions
+LLM_CONTEXTUAL = False
+
+# Number of previous days kept as context in contextual mode. The model's token context
+# is carried from day to day and rebuilt from the last N summaries every N days.
+LLM_CONTEXT_WINDOW = 5
+
+# Seconds a generation may wait for LLM summaries (None waits indefinitely). Days still
+# waiting get a quick extractive summary and an upgraded workbook is prepared in the background.
+GENERATION_DEADLINE_SECONDS = 120
+
+# Maximum number of words allowed in a task summary
+SUMMARY_MAX_WORDS = 30
+
+# Persistent summary cache settings
+SUMMARY_CACHE = {
+    'directory': '.cache',
+    'max_entries': 10000,
+    'max_age_days': 90
+}
+
+# Background generation jobs: worker threads, seconds finished jobs are kept, UI polling interval in seconds
+JOB_SETTINGS = {
+    'workers': 2,
+    'expiry_seconds': 3600,
+    'poll_interval': 1.0
+}
+
+# Speculative summarization of edited descriptions before Generate is clicked: seconds the
+# text must stay unchanged first, maximum descriptions per attempt, worker threads shared by all sessions
+SPECULATION = {
+    'enabled': True,
+    'debounce_seconds': 3,
+    'max_descriptions': 20,
+    'workers': 2
+}
+
+# Profile generation runs with cProfile and offer the .prof file for download. This is the
+# default of the sidebar toggle; set the TIMESHEET_PROFILE=1 environment variable to enable it
+PROFILE_GENERATION = os.environ.get('TIMESHEET_PROFILE', '0') == '1'
+
+# Number of generated timesheets kept per session for reuse across reruns
+SESSION_RESULTS_MAX = 5
+
+# File to write process-wide metrics to in Prometheus text format (None disables)
+METRICS_FILE = None
+
+# Excel writer backend: 'standard' (in-memory workbook) or 'write_only' (streamed to disk)
+EXCEL_BACKEND = 'standard'
+
 # Excel styling settings
 EXCEL_STYLES = {
     'header_font_size': 12,
@@ -1,16 +1,24 @@
-import streamlit as st
-from datetime import datetime
-from config.settings import DEFAULT_WORK_HOURS
+from datetime import date as date_type, datetime
+from config.settings import DEFAULT_WORK_HOURS, PROFILE_GENERATION
 
 class Holiday:
     """Model for holiday data"""
     def __init__(self, date, name):
         self.date = date
         self.name = name
+    
+    def __eq__(self, other):
+        return isinstance(other, Holiday) and (self.date, self.name) == (other.date, other.name)
+    
+    def __hash__(self):
+        return hash((self.date, self.name))
+    
+    def __repr__(self):
+        return f"Holiday({self.date!r}, {self.name!r})"
         
     def to_dict(self):
         return {
-            'date': self.date.strftime('%Y-%m-%d') if isinstance(self.date, datetime) else self.date,
+            'date': self.date.strftime('%Y-%m-%d') if isinstance(self.date, date_type) else self.date,
             'name': self.name
         }
     
@@ -37,7 +45,18 @@ class WorkHours:
 
 def initialize_session_state():
     """Initialize session state with default values if not already set"""
+    # Imported here so the engine and CLI can use the models without Streamlit
+    import streamlit as st
+    
     if 'holidays' not in st.session_state:
         st.session_state.holidays = []
     if 'work_hours' not in st.session_state:
-        st.session_state.work_hours = DEFAULT_WORK_HOURS
\ No newline at end of file
+        st.session_state.work_hours = DEFAULT_WORK_HOURS
+    if 'results' not in st.session_state:
+        st.session_state.results = {}
+    if 'summary_store' not in st.session_state:
+        st.session_state.summary_store = {}
+    if 'collected_jobs' not in st.session_state:
+        st.session_state.collected_jobs = set()
+    if 'profile_generation' not in st.session_state:
+        st.session_state.profile_generation = PROFILE_GENERATION
\ No newline at end of file
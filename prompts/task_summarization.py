@@ -1,5 +1,3 @@
-from langchain.prompts import PromptTemplate
-
 # Prompt template for task summarization
 TASK_SUMMARIZATION_TEMPLATE = """Write a concise task summary for the daily work report based on the following description: {description}. 
 
@@ -12,6 +10,52 @@ Guidelines:
 
 Provide only the summary without any additional text or explanations."""
 
+# Prompt template for summarizing several days in a single call
+BATCH_SUMMARIZATION_TEMPLATE = """Write a concise task summary for the daily work report for each of the following {count} numbered descriptions:
+
+{descriptions}
+
+Guidelines:
+- Each summary should be professional, direct, and no more than 30 words.
+- Include specific tools or steps relevant to the task (e.g., VSCode, Git, Docker, Anaconda).
+- For brief descriptions, infer and include relevant subtasks.
+- For detailed descriptions, condense the information.
+- Do not use bullet points or other formatting; each summary should be a single paragraph or sentence.
+
+Return exactly {count} lines, one per description, in the same order, each starting with its number followed by a period (e.g., "1. summary").
+Provide only the numbered summaries without any additional text or explanations."""
+
+# Prompt template that starts a contextual summarization chain with the previous days' summaries
+CONTEXTUAL_SUMMARIZATION_TEMPLATE = """Write a concise task summary for the daily work report based on the following description: {description}. 
+
+Summaries of the previous days in the same report, oldest first:
+{history}
+
+Guidelines:
+- The summary should be professional, direct, and no more than 30 words.
+- Include specific tools or steps relevant to the task (e.g., VSCode, Git, Docker, Anaconda).
+- For brief descriptions, infer and include relevant subtasks.
+- For detailed descriptions, condense the information.
+- If the description is vague or asks you to fill in the day, continue the work of the previous days.
+- Do not use bullet points or other formatting; the summary should be a single paragraph or sentence.
+
+Provide only the summary without any additional text or explanations."""
+
+# Prompt template for the following days of a contextual chain; earlier turns are carried in the model context
+CONTEXTUAL_FOLLOWUP_TEMPLATE = """Next day's description: {description}. 
+
+Write the summary for this day following the same guidelines, using the previous days as context.
+Provide only the summary without any additional text or explanations."""
+
+# Prompt template for one chunk of a description too long for a single prompt
+CHUNK_SUMMARIZATION_TEMPLATE = """The following is part {part} of {parts} of one day's work notes for a daily work report:
+
+{chunk}
+
+Summarize this part in a few sentences, keeping every distinct task, tool and outcome it mentions.
+Do not use bullet points or other formatting.
+Provide only the summary without any additional text or explanations."""
+
 def get_task_summarization_prompt():
     """
     Get the PromptTemplate for task summarization
@@ -19,11 +63,55 @@ def get_task_summarization_prompt():
     Returns:
         PromptTemplate: The task summarization prompt template
     """
+    from langchain.prompts import PromptTemplate
+    
     return PromptTemplate(
         input_variables=["description"],
         template=TASK_SUMMARIZATION_TEMPLATE
     )
 
+def get_batch_summarization_prompt():
+    """
+    Get the PromptTemplate for summarizing several tasks in one call
+    
+    Returns:
+        PromptTemplate: The batch task summarization prompt template
+    """
+    from langchain.prompts import PromptTemplate
+    
+    return PromptTemplate(
+        input_variables=["count", "descriptions"],
+        template=BATCH_SUMMARIZATION_TEMPLATE
+    )
+
+def get_contextual_summarization_prompts():
+    """
+    Get the PromptTemplates for contextual summarization
+    
+    Returns:
+        tuple: (PromptTemplate starting a chain, PromptTemplate for the following days)
+    """
+    from langchain.prompts import PromptTemplate
+    
+    return (
+        PromptTemplate(input_variables=["description", "history"], template=CONTEXTUAL_SUMMARIZATION_TEMPLATE),
+        PromptTemplate(input_variables=["description"], template=CONTEXTUAL_FOLLOWUP_TEMPLATE)
+    )
+
+def get_chunk_summarization_prompt():
+    """
+    Get the PromptTemplate for summarizing one chunk of a long description
+    
+    Returns:
+        PromptTemplate: The chunk summarization prompt template
+    """
+    from langchain.prompts import PromptTemplate
+    
+    return PromptTemplate(
+        input_variables=["part", "parts", "chunk"],
+        template=CHUNK_SUMMARIZATION_TEMPLATE
+    )
+
 
 """
 10 Mon: Received laptop is setup by installing all tools and dependency for coding
@@ -0,0 +1,152 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from utils.resources import shared_resource
+from config.settings import SUMMARY_CACHE
+
+logger = logging.getLogger("timesheet.cache")
+
+class SummaryCache:
+    """Persistent SQLite cache for task summaries"""
+
+    # Run eviction after this many writes
+    EVICT_INTERVAL = 100
+
+    def __init__(self, directory, max_entries, max_age_days):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "summaries.sqlite3")
+        self.max_entries = max_entries
+        self.max_age = max_age_days * 24 * 60 * 60
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "key TEXT PRIMARY KEY, summary TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON summaries (accessed_at)")
+        self.evict()
+
+    @contextmanager
+    def _connect(self):
+        # A fresh connection per operation keeps the cache safe across threads and processes
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(*parts):
+        """
+        Build a cache key from the given parts
+
+        Args:
+            *parts (str): Values that identify a summary (model, prompt, description)
+
+        Returns:
+            str: Hex digest of the parts
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Look up a cached summary
+
+        Args:
+            key (str): Cache key from make_key
+
+        Returns:
+            str or None: Cached summary, or None on a miss
+        """
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT summary, created_at FROM summaries WHERE key = ?", (key,)
+            ).fetchone()
+            if row and now - row[1] <= self.max_age:
+                conn.execute("UPDATE summaries SET accessed_at = ? WHERE key = ?", (now, key))
+            else:
+                row = None
+
+        with self._lock:
+            if row:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return row[0] if row else None
+
+    def set(self, key, summary):
+        """
+        Store a summary in the cache
+
+        Args:
+            key (str): Cache key from make_key
+            summary (str): Summary to store
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, summary, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, summary, now, now)
+            )
+
+        with self._lock:
+            self._writes += 1
+            evict = self._writes % self.EVICT_INTERVAL == 0
+        if evict:
+            self.evict()
+
+    def evict(self):
+        """Remove expired entries and trim the cache to max_entries, least recently used first"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM summaries WHERE created_at < ?", (time.time() - self.max_age,))
+            conn.execute(
+                "DELETE FROM summaries WHERE key IN ("
+                "SELECT key FROM summaries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def stats(self):
+        """
+        Get cache hit/miss counters
+
+        Returns:
+            dict: Hits, misses and number of stored entries
+        """
+        with self._connect() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': entries}
+
+@shared_resource
+def get_summary_cache():
+    """
+    Initialize and cache the persistent summary cache
+
+    Returns:
+        SummaryCache or None: Summary cache or None if it cannot be opened
+    """
+    try:
+        return SummaryCache(
+            SUMMARY_CACHE['directory'],
+            SUMMARY_CACHE['max_entries'],
+            SUMMARY_CACHE['max_age_days']
+        )
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Summary cache disabled: {e}")
+        return None
@@ -1,122 +1,394 @@
 import openpyxl
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle, DEFAULT_FONT
 import io
-import streamlit as st
-from utils.helpers import ordinal_suffix, parse_descriptions
-from services.llm_service import summarize_task
-from config.settings import EXCEL_STYLES
+import time
+from copy import copy
+from utils.helpers import ordinal_suffix, parse_descriptions, extractive_summary
+from services.llm_service import iter_summaries, iter_contextual_summaries
+from services.metrics_service import RunMetrics
+from config.settings import EXCEL_STYLES, EXCEL_BACKEND, LLM_STREAMING, LLM_CONTEXTUAL, SUMMARY_MAX_WORDS
 
-def generate_excel_timesheet(employee_info, date_range, descriptions_text, dates, progress_bar, status_text):
+# Column headers of the timesheet table
+HEADERS = [
+    "Date", "Day", "Status", "Start Time", "End Time",
+    "Duration (hrs)", "Task Details"
+]
+
+# Named style used for each kind of data row
+ROW_STYLES = {
+    None: "timesheet_cell",
+    "weekend": "timesheet_weekend",
+    "holiday": "timesheet_holiday",
+    "leave": "timesheet_leave"
+}
+
+def build_timesheet(employee_info, date_range, descriptions_text, dates, holidays, work_hours, progress_callback=None,
+                    metrics=None, summary_store=None, row_callback=None, deadline=None, late_rows=None):
     """
-    Generate an Excel timesheet based on the provided information
+    Build an Excel timesheet without any Streamlit dependency
     
     Args:
         employee_info (dict): Employee information dictionary
         date_range (tuple): Tuple containing start_date and end_date
-        descriptions_text (str): Text from the descriptions text area
+        descriptions_text (str): Daily descriptions, one 'day day_name: description' line per day
         dates (list): List of dates within the range
-        progress_bar (streamlit.delta_generator.DeltaGenerator): Streamlit progress bar
-        status_text (streamlit.delta_generator.DeltaGenerator): Streamlit text for status updates
+        holidays (HolidayCalendar): Holidays to mark on the timesheet
+        work_hours (dict): Work hours dictionary with 'start', 'end' and 'duration' keys
+        progress_callback (callable, optional): Called as progress_callback(fraction, message)
+        metrics (RunMetrics, optional): Collector for per-stage timings and LLM statistics
+        summary_store (dict, optional): Summaries from a previous run, see iter_timesheet_rows.
+            When given, preview rows get an "Updated" column marking re-summarized days.
+        row_callback (callable, optional): Receives rows as they are classified and summarized,
+            see iter_timesheet_rows
+        deadline (float, optional): time.monotonic() value by which summaries must arrive,
+            see iter_timesheet_rows
+        late_rows (list, optional): Receives the indices of rows that missed the deadline
     
     Returns:
-        tuple: (io.BytesIO with Excel file, list of preview data dictionaries)
+        tuple: (io.BytesIO with Excel file, list of preview data dictionaries with the
+            model behind each task in "Model")
+    """
+    metrics = metrics or RunMetrics()
+    previous_store = dict(summary_store) if summary_store else None
+    
+    # Preview data
+    preview_data = []
+    row_models = {}
+    
+    def rows_with_preview():
+        for row_data, row_style in iter_timesheet_rows(
+            date_range, descriptions_text, dates, holidays, work_hours, progress_callback, metrics, summary_store,
+            row_callback, deadline, late_rows, row_models
+        ):
+            preview_data.append({
+                "Date": row_data[0],
+                "Day": row_data[1],
+                "Status": row_data[2],
+                "Task": row_data[6] if row_data[6] else "N/A",
+                "Model": row_models.get(len(preview_data)) or ""
+            })
+            yield row_data, row_style
+    
+    # Save to BytesIO for download
+    output = io.BytesIO()
+    render_workbook([("Timesheet", employee_info, date_range, rows_with_preview())], output, metrics=metrics)
+    output.seek(0)
+    
+    # Mark the rows whose summary was recomputed rather than reused
+    if previous_store is not None:
+        for date, preview in zip(dates, preview_data):
+            entry = summary_store.get(date)
+            preview["Updated"] = "✓" if entry is not None and previous_store.get(date) != entry else ""
+    
+    return output, preview_data
+
+def classify_date(date, description, holiday_name, work_hours):
+    """
+    Determine the status, times and task of a single timesheet row
+    
+    Args:
+        date (datetime.date): Date of the row
+        description (str): Description entered for the date ("" if none)
+        holiday_name (str or None): Name of the predefined holiday on this date, if any
+        work_hours (dict): Work hours dictionary with 'start', 'end' and 'duration' keys
+    
+    Returns:
+        tuple: (list of cell values, row style key from ROW_STYLES, whether the
+            description still needs to be summarized into the task column)
+    """
+    # Initialize row data
+    status = ""
+    start_time = ""
+    end_time = ""
+    duration = ""
+    task = ""
+    
+    # Format date and day
+    day_suffix = ordinal_suffix(date.day)
+    date_str = f"{date.day}{day_suffix} {date.strftime('%b %Y')}"
+    day_name = date.strftime('%a')
+    
+    summarize = False
+    
+    # Determine if it's a working day
+    if holiday_name is not None:
+        status = f"Holiday - {holiday_name}"
+        row_style = "holiday"
+    elif description.lower().startswith("holiday"):
+        status = "Holiday"
+        if len(description) > 7:  # If there's more text after "holiday"
+            status = description
+        row_style = "holiday"
+    elif description.lower().startswith("leave"):
+        status = "Leave"
+        if len(description) > 5:  # If there's more text after "leave"
+            status = description
+        row_style = "leave"
+    elif description.lower().startswith("weekend") or date.weekday() >= 5:
+        status = "Weekend"
+        row_style = "weekend"
+    elif description.strip() == "":
+        if date.weekday() >= 5:  # Saturday (5) or Sunday (6)
+            status = "Weekend"
+            row_style = "weekend"
+        else:
+            status = "Regular Day"
+            row_style = None
+    else:
+        # Working day
+        status = "Regular Day"
+        start_time = work_hours['start']
+        end_time = work_hours['end']
+        duration = work_hours['duration']
+        row_style = None
+        
+        # Leave the task for LLM summarization
+        if description and not description.lower().startswith(("holiday", "leave", "weekend")):
+            summarize = True
+        else:
+            task = description
+    
+    return [date_str, day_name, status, start_time, end_time, duration, task], row_style, summarize
+
+def iter_timesheet_rows(date_range, descriptions_text, dates, holidays, work_hours, progress_callback=None,
+                        metrics=None, summary_store=None, row_callback=None, deadline=None, late_rows=None,
+                        row_models=None):
+    """
+    Classify each date and summarize working days, yielding rows in date order
+    
+    Rows are yielded as soon as every earlier row is complete, so the workbook can
+    be written while later summaries are still in flight.
+    
+    Args:
+        date_range (tuple): Tuple containing start_date and end_date
+        descriptions_text (str): Daily descriptions, one 'day day_name: description' line per day
+        dates (list): List of dates within the range
+        holidays (HolidayCalendar): Holidays to mark on the timesheet
+        work_hours (dict): Work hours dictionary with 'start', 'end' and 'duration' keys
+        progress_callback (callable, optional): Called as progress_callback(fraction, message)
+        metrics (RunMetrics, optional): Collector for per-stage timings and LLM statistics
+        summary_store (dict, optional): Mapping of date to (description, summary, model) from a
+            previous run. Days whose description is unchanged reuse the stored summary
+            instead of calling the LLM; the store is updated in place with this run's summaries.
+        row_callback (callable, optional): Called as row_callback(index, row_data, pending) for
+            every row once classified, again with the partial task while its summary streams in
+            (when LLM_STREAMING is enabled) and once the summary is complete. Streamed updates
+            arrive from worker threads.
+        deadline (float, optional): time.monotonic() value by which summaries must arrive. Rows
+            still waiting then, like rows whose summarization failed, get a quick extractive
+            summary of their description.
+        late_rows (list, optional): Receives the indices of rows that missed the deadline
+        row_models (dict, optional): Receives the model that produced each summarized row's
+            task by row index ("extractive" for quick summaries), set before the row is yielded
+    
+    Yields:
+        tuple: (list of cell values, row style key from ROW_STYLES)
     """
     start_date, end_date = date_range
+    metrics = metrics or RunMetrics()
     
     # Parse descriptions
-    date_to_desc = parse_descriptions(descriptions_text, dates)
+    with metrics.stage("parse"):
+        date_to_desc = parse_descriptions(descriptions_text, dates)
     
     # Check if any predefined holidays fall within the date range
-    holiday_dict = {}
-    for holiday in st.session_state.holidays:
-        try:
-            if isinstance(holiday, dict):
-                holiday_date = holiday['date']
-                if isinstance(holiday_date, str):
-                    import datetime
-                    holiday_date = datetime.datetime.strptime(holiday_date, '%Y-%m-%d').date()
-                if start_date <= holiday_date <= end_date:
-                    holiday_dict[holiday_date] = holiday['name']
-        except (ValueError, KeyError):
-            continue  # Skip invalid holiday entries
-    
-    # Create Excel workbook with styling
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Timesheet"
-    
-    # Define styles
-    header_font = Font(bold=True, size=EXCEL_STYLES['header_font_size'])
-    header_fill = PatternFill(
-        start_color=EXCEL_STYLES['header_bg_color'], 
-        end_color=EXCEL_STYLES['header_bg_color'], 
-        fill_type="solid"
-    )
-    header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    normal_alignment = Alignment(vertical="center", wrap_text=True)
+    with metrics.stage("holidays"):
+        holiday_dict = {holiday.date: holiday.name for holiday in holidays.between(start_date, end_date)}
+    
+    # Classify every date first so summaries can be requested up front
+    rows = []
+    pending = {}
+    with metrics.stage("classify"):
+        for i, date in enumerate(dates):
+            description = date_to_desc.get(date, "")
+            row_data, row_style, summarize = classify_date(date, description, holiday_dict.get(date), work_hours)
+            if summarize:
+                pending[i] = description
+            rows.append((row_data, row_style))
+    if row_models is None:
+        row_models = {}
+    
+    # Only re-summarize descriptions that were added or changed since the previous run. In
+    # contextual mode a summary also depends on earlier days, so every day goes through the
+    # summary cache instead, whose keys cover the context window.
+    if summary_store is not None and not LLM_CONTEXTUAL:
+        for i, description in list(pending.items()):
+            previous = summary_store.get(dates[i])
+            if previous is not None and previous[0] == description:
+                rows[i][0][6] = previous[1]
+                if len(previous) > 2:
+                    row_models[i] = previous[2]
+                del pending[i]
+    
+    on_token = None
+    if row_callback:
+        for i, (row_data, _) in enumerate(rows):
+            row_callback(i, row_data, i in pending)
+        
+        if LLM_STREAMING:
+            def stream_row(i, text):
+                row_callback(i, rows[i][0][:6] + [text], True)
+            on_token = stream_row
+    
+    # Summarize all working days (concurrently unless in contextual mode) and yield rows as results arrive
+    if LLM_CONTEXTUAL:
+        summaries = iter_contextual_summaries(dict(pending), metrics=metrics, on_token=on_token, deadline=deadline)
+    else:
+        summaries = iter_summaries(dict(pending), metrics=metrics, on_token=on_token, deadline=deadline)
+    total = len(pending)
+    completed = 0
+    next_row = 0
+    while next_row < len(rows):
+        if next_row in pending:
+            # Time spent waiting on the LLM
+            with metrics.stage("summarize"):
+                i, summary = next(summaries)
+            completed += 1
+            if progress_callback:
+                # Second half for summarization
+                progress_callback(0.5 + completed / (total * 2), f"Summarized {completed}/{total} tasks")
+            # A summary equal to the description is the fallback after an LLM error. Like a
+            # missed deadline, it gets a quick extractive summary and is retried next run.
+            if summary is None or summary == pending[i]:
+                if summary is None and late_rows is not None:
+                    late_rows.append(i)
+                summary = extractive_summary(pending[i], SUMMARY_MAX_WORDS)
+                row_models[i] = "extractive"
+            else:
+                row_models[i] = metrics.model_for(pending[i])
+                if summary_store is not None:
+                    summary_store[dates[i]] = (pending[i], summary, row_models[i])
+            rows[i][0][6] = summary
+            metrics.mark_first_row()
+            if row_callback:
+                row_callback(i, rows[i][0], False)
+            del pending[i]
+            continue
+        yield rows[next_row]
+        next_row += 1
+
+def register_styles(wb):
+    """
+    Register the shared named styles used by timesheet sheets
+    
+    Args:
+        wb (openpyxl.Workbook): Workbook to register the styles on
+    """
     border = Border(
         left=Side(style='thin'), 
         right=Side(style='thin'), 
         top=Side(style='thin'), 
         bottom=Side(style='thin')
     )
-    weekend_fill = PatternFill(
-        start_color=EXCEL_STYLES['weekend_bg_color'], 
-        end_color=EXCEL_STYLES['weekend_bg_color'], 
-        fill_type="solid"
-    )
-    holiday_fill = PatternFill(
-        start_color=EXCEL_STYLES['holiday_bg_color'], 
-        end_color=EXCEL_STYLES['holiday_bg_color'], 
-        fill_type="solid"
-    )
-    leave_fill = PatternFill(
-        start_color=EXCEL_STYLES['leave_bg_color'], 
-        end_color=EXCEL_STYLES['leave_bg_color'], 
-        fill_type="solid"
-    )
-    
-    # Add title and employee information
-    ws.merge_cells('A1:G1')
-    ws['A1'] = f"Timesheet: {start_date.strftime('%d %b %Y')} to {end_date.strftime('%d %b %Y')}"
-    ws['A1'].font = Font(bold=True, size=EXCEL_STYLES['title_font_size'])
-    ws['A1'].alignment = Alignment(horizontal="center")
+    normal_alignment = Alignment(vertical="center", wrap_text=True)
+    # A named style without a font gets a bare Font(); data cells keep the workbook default
+    data_font = copy(DEFAULT_FONT)
     
-    ws.merge_cells('A2:C2')
-    ws['A2'] = f"Employee: {employee_info['name']}"
-    ws['A2'].font = Font(bold=True)
+    def solid_fill(color):
+        return PatternFill(start_color=color, end_color=color, fill_type="solid")
     
-    ws.merge_cells('D2:E2')
-    ws['D2'] = f"Designation: {employee_info['designation']}"
-    ws['D2'].font = Font(bold=True)
+    styles = [
+        NamedStyle(
+            name="timesheet_title",
+            font=Font(bold=True, size=EXCEL_STYLES['title_font_size']),
+            alignment=Alignment(horizontal="center")
+        ),
+        NamedStyle(name="timesheet_label", font=Font(bold=True)),
+        NamedStyle(
+            name="timesheet_header",
+            font=Font(bold=True, size=EXCEL_STYLES['header_font_size']),
+            fill=solid_fill(EXCEL_STYLES['header_bg_color']),
+            alignment=Alignment(horizontal="center", vertical="center", wrap_text=True),
+            border=border
+        ),
+        NamedStyle(name="timesheet_cell", font=data_font, alignment=normal_alignment, border=border),
+        NamedStyle(
+            name="timesheet_weekend",
+            font=data_font,
+            fill=solid_fill(EXCEL_STYLES['weekend_bg_color']),
+            alignment=normal_alignment,
+            border=border
+        ),
+        NamedStyle(
+            name="timesheet_holiday",
+            font=data_font,
+            fill=solid_fill(EXCEL_STYLES['holiday_bg_color']),
+            alignment=normal_alignment,
+            border=border
+        ),
+        NamedStyle(
+            name="timesheet_leave",
+            font=data_font,
+            fill=solid_fill(EXCEL_STYLES['leave_bg_color']),
+            alignment=normal_alignment,
+            border=border
+        )
+    ]
+    for style in styles:
+        wb.add_named_style(style)
+
+def render_workbook(sheets, output, backend=EXCEL_BACKEND, metrics=None):
+    """
+    Write one or more timesheet sheets to a workbook
     
-    ws.merge_cells('F2:G2')
-    ws['F2'] = f"Department: {employee_info['department']}"
-    ws['F2'].font = Font(bold=True)
+    Args:
+        sheets (iterable): (sheet title, employee_info, date_range, rows) tuples, where rows
+            yields (list of cell values, row style key) pairs as from iter_timesheet_rows
+        output (str or file-like): Path or binary stream to save the workbook to
+        backend (str): 'standard' for an in-memory workbook or 'write_only' to stream
+            rows to disk with flat memory usage
+        metrics (RunMetrics, optional): Collector for per-stage timings
+    """
+    metrics = metrics or RunMetrics()
+    write_only = backend == "write_only"
+    with metrics.stage("render"):
+        wb = openpyxl.Workbook(write_only=write_only)
+        if not write_only:
+            wb.remove(wb.active)
+        register_styles(wb)
     
-    ws.merge_cells('A3:C3')
-    ws['A3'] = f"Employee ID: {employee_info['employee_id']}"
-    ws['A3'].font = Font(bold=True)
+    for title, employee_info, date_range, rows in sheets:
+        ws = wb.create_sheet(title)
+        _write_sheet(ws, employee_info, date_range, rows, write_only, metrics)
     
-    # Empty row
-    ws.append([])
+    with metrics.stage("save"):
+        wb.save(output)
+
+def _write_sheet(ws, employee_info, date_range, rows, write_only, metrics):
+    """
+    Write the title, employee information, rows and signature section of one sheet
+    """
+    start_date, end_date = date_range
+    row_num = 0
     
-    # Write headers on row 5
-    headers = [
-        "Date", "Day", "Status", "Start Time", "End Time",
-        "Duration (hrs)", "Task Details"
-    ]
-    ws.append(headers)
+    def append(values, styles):
+        """Append a row, applying a named style to each cell that has one"""
+        nonlocal row_num
+        row_num += 1
+        start = time.perf_counter()
+        if write_only:
+            cells = []
+            for value, style in zip(values, styles):
+                cell = WriteOnlyCell(ws, value=value)
+                if style:
+                    cell.style = style
+                cells.append(cell)
+            ws.append(cells)
+        else:
+            ws.append(values)
+            for col, style in enumerate(styles, start=1):
+                if style:
+                    ws.cell(row=row_num, column=col).style = style
+        metrics.add_stage_time("render", time.perf_counter() - start)
     
-    # Style headers
-    for col in range(1, len(headers) + 1):
-        cell = ws.cell(row=5, column=col)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_alignment
-        cell.border = border
+    def merge(cell_range):
+        if write_only:
+            ws.merged_cells.add(cell_range)
+        else:
+            ws.merge_cells(cell_range)
     
-    # Adjust column widths
+    # Adjust column widths (write-only sheets need them before any row is written)
     column_widths = EXCEL_STYLES['column_widths']
     ws.column_dimensions['A'].width = column_widths['date']
     ws.column_dimensions['B'].width = column_widths['day']
@@ -126,107 +398,43 @@ def generate_excel_timesheet(employee_info, date_range, descriptions_text, dates
     ws.column_dimensions['F'].width = column_widths['duration']
     ws.column_dimensions['G'].width = column_widths['task']
     
-    # Preview data
-    preview_data = []
-    
-    # Fill in rows for each date
-    for i, date in enumerate(dates):
-        row_num = i + 6  # Starting from row 6 after headers
-        
-        status_text.text(f"Processing date {i+1}/{len(dates)}")
-        progress_bar.progress(0.5 + (i + 1) / (len(dates) * 2))  # Second half for Excel generation
-        
-        description = date_to_desc.get(date, "")
-        
-        # Initialize row data
-        status = ""
-        start_time = ""
-        end_time = ""
-        duration = ""
-        task = ""
-        
-        # Format date and day
-        day_suffix = ordinal_suffix(date.day)
-        date_str = f"{date.day}{day_suffix} {date.strftime('%b %Y')}"
-        day_name = date.strftime('%a')
-        
-        # Determine if it's a working day
-        if date in holiday_dict:
-            status = f"Holiday - {holiday_dict[date]}"
-            row_fill = holiday_fill
-        elif description.lower().startswith("holiday"):
-            status = "Holiday"
-            if len(description) > 7:  # If there's more text after "holiday"
-                status = description
-            row_fill = holiday_fill
-        elif description.lower().startswith("leave"):
-            status = "Leave"
-            if len(description) > 5:  # If there's more text after "leave"
-                status = description
-            row_fill = leave_fill
-        elif description.lower().startswith("weekend") or date.weekday() >= 5:
-            status = "Weekend"
-            row_fill = weekend_fill
-        elif description.strip() == "":
-            if date.weekday() >= 5:  # Saturday (5) or Sunday (6)
-                status = "Weekend"
-                row_fill = weekend_fill
-            else:
-                status = "Regular Day"
-                row_fill = None
-        else:
-            # Working day
-            status = "Regular Day"
-            start_time = st.session_state.work_hours['start']
-            end_time = st.session_state.work_hours['end']
-            duration = st.session_state.work_hours['duration']
-            row_fill = None
-            
-            # Use LLM to summarize task
-            if description and not description.lower().startswith(("holiday", "leave", "weekend")):
-                task = summarize_task(description)
-            else:
-                task = description
-        
-        # Write row to Excel
-        row_data = [date_str, day_name, status, start_time, end_time, duration, task]
-        ws.append(row_data)
-        
-        # Add to preview data
-        preview_data.append({
-            "Date": date_str,
-            "Day": day_name,
-            "Status": status,
-            "Task": task if task else "N/A"
-        })
-        
-        # Style the row
-        for col in range(1, len(row_data) + 1):
-            cell = ws.cell(row=row_num, column=col)
-            cell.border = border
-            cell.alignment = normal_alignment
-            if row_fill:
-                cell.fill = row_fill
+    # Add title and employee information
+    append(
+        [f"Timesheet: {start_date.strftime('%d %b %Y')} to {end_date.strftime('%d %b %Y')}"],
+        ["timesheet_title"]
+    )
+    merge('A1:G1')
     
-    # Add signature section
-    ws.append([])
-    last_row = len(dates) + 7
+    append(
+        [
+            f"Employee: {employee_info['name']}", None, None,
+            f"Designation: {employee_info['designation']}", None,
+            f"Department: {employee_info['department']}"
+        ],
+        ["timesheet_label", None, None, "timesheet_label", None, "timesheet_label"]
+    )
+    merge('A2:C2')
+    merge('D2:E2')
+    merge('F2:G2')
     
-    ws.merge_cells(f'A{last_row}:C{last_row}')
-    ws[f'A{last_row}'] = "Employee Signature"
-    ws[f'A{last_row}'].font = Font(bold=True)
+    append([f"Employee ID: {employee_info['employee_id']}"], ["timesheet_label"])
+    merge('A3:C3')
     
-    ws.merge_cells(f'E{last_row}:G{last_row}')
-    ws[f'E{last_row}'] = "Manager Signature"
-    ws[f'E{last_row}'].font = Font(bold=True)
+    # Empty row
+    append([], [])
     
-    # Save to BytesIO for download
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
+    # Write headers on row 5
+    append(HEADERS, ["timesheet_header"] * len(HEADERS))
     
-    # Clear progress indicators
-    progress_bar.empty()
-    status_text.empty()
+    # Fill in rows for each date, starting from row 6 after headers
+    for row_data, row_style in rows:
+        append(row_data, [ROW_STYLES[row_style]] * len(row_data))
     
-    return output, preview_data
\ No newline at end of file
+    # Add signature section
+    append([], [])
+    append(
+        ["Employee Signature", None, None, None, "Manager Signature"],
+        ["timesheet_label", None, None, None, "timesheet_label"]
+    )
+    merge(f'A{row_num}:C{row_num}')
+    merge(f'E{row_num}:G{row_num}')
@@ -0,0 +1,218 @@
+import bisect
+import csv
+import logging
+import os
+from datetime import datetime, timedelta
+from models.timesheet import Holiday
+from utils.resources import shared_resource
+from config.settings import HOLIDAY_CALENDAR_DIR
+
+logger = logging.getLogger("timesheet.holidays")
+
+class HolidayCalendar:
+    """Sorted, date-indexed collection of holidays supporting fast range queries"""
+
+    def __init__(self, holidays=()):
+        # Later holidays on the same date replace earlier ones
+        by_date = {}
+        for holiday in holidays:
+            by_date[holiday.date] = holiday
+        self._dates = sorted(by_date)
+        self._holidays = [by_date[d] for d in self._dates]
+
+    def __len__(self):
+        return len(self._holidays)
+
+    def __iter__(self):
+        return iter(self._holidays)
+
+    def between(self, start_date, end_date):
+        """
+        Get the holidays within a date range
+
+        Args:
+            start_date (datetime.date): First date of the range, inclusive
+            end_date (datetime.date): Last date of the range, inclusive
+
+        Returns:
+            list: Holiday objects in date order
+        """
+        lo = bisect.bisect_left(self._dates, start_date)
+        hi = bisect.bisect_right(self._dates, end_date)
+        return self._holidays[lo:hi]
+
+    def with_holidays(self, holidays):
+        """
+        Layer additional holidays on top of this calendar
+
+        Args:
+            holidays (iterable): Holiday objects that take precedence on the same date
+
+        Returns:
+            HolidayCalendar: New calendar containing both sets of holidays
+        """
+        return HolidayCalendar(list(self._holidays) + list(holidays))
+
+def _unescape_ics(value):
+    return value.replace("\\n", " ").replace("\\N", " ").replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\")
+
+def _parse_ics_date(value):
+    # DATE values are YYYYMMDD; DATE-TIME values start with the same eight digits
+    return datetime.strptime(value[:8], '%Y%m%d').date()
+
+def load_ics(path):
+    """
+    Load holidays from an iCalendar (.ics) file
+
+    Every VEVENT with a DTSTART becomes a holiday named after its SUMMARY.
+    All-day events spanning several days produce one holiday per day.
+    Recurrence rules are not expanded.
+
+    Args:
+        path (str): Path to the .ics file
+
+    Returns:
+        list: Holiday objects
+    """
+    with open(path, encoding="utf-8") as f:
+        raw_lines = f.read().splitlines()
+
+    # Unfold continuation lines (RFC 5545 section 3.1)
+    lines = []
+    for line in raw_lines:
+        if line[:1] in (" ", "\t") and lines:
+            lines[-1] += line[1:]
+        else:
+            lines.append(line)
+
+    holidays = []
+    event = None
+    for line in lines:
+        if line == "BEGIN:VEVENT":
+            event = {}
+        elif line == "END:VEVENT":
+            if event and 'DTSTART' in event:
+                try:
+                    start = _parse_ics_date(event['DTSTART'])
+                    end = _parse_ics_date(event['DTEND']) if 'DTEND' in event else start + timedelta(days=1)
+                except ValueError:
+                    event = None
+                    continue  # Skip events with invalid dates
+                name = _unescape_ics(event.get('SUMMARY', 'Holiday'))
+                day = start
+                while True:
+                    holidays.append(Holiday(day, name))
+                    day += timedelta(days=1)
+                    if day >= end:
+                        break
+            event = None
+        elif event is not None and ":" in line:
+            key, value = line.split(":", 1)
+            event[key.split(";", 1)[0].upper()] = value.strip()
+    return holidays
+
+def load_csv(path):
+    """
+    Load holidays from a CSV file with 'date' (YYYY-MM-DD) and 'name' columns
+
+    Args:
+        path (str): Path to the .csv file
+
+    Returns:
+        list: Holiday objects
+    """
+    holidays = []
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            try:
+                holidays.append(Holiday.from_dict(row))
+            except (ValueError, KeyError, TypeError):
+                continue  # Skip invalid holiday entries
+    return holidays
+
+# Calendar loaders by file extension
+LOADERS = {
+    '.ics': load_ics,
+    '.csv': load_csv
+}
+
+def load_holiday_files(paths):
+    """
+    Load holidays from ICS/CSV files into a calendar
+
+    Args:
+        paths (iterable): Paths of calendar files; later files take precedence
+
+    Returns:
+        HolidayCalendar: Calendar with the holidays from every file
+    """
+    holidays = []
+    for path in paths:
+        loader = LOADERS.get(os.path.splitext(path)[1].lower())
+        if loader:
+            holidays.extend(loader(path))
+    return HolidayCalendar(holidays)
+
+def _calendar_files(directory):
+    """
+    List the calendar files in a directory with their modification times
+
+    Returns:
+        tuple: Sorted (path, mtime) pairs, usable as a cache key
+    """
+    if not os.path.isdir(directory):
+        return ()
+    files = []
+    for file_name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, file_name)
+        if os.path.splitext(file_name)[1].lower() in LOADERS and os.path.isfile(path):
+            files.append((path, os.path.getmtime(path)))
+    return tuple(files)
+
+@shared_resource(max_entries=1)
+def _load_calendar(files):
+    # Returns (calendar, error message or None); the error is kept so the UI can show it
+    try:
+        return load_holiday_files(path for path, _ in files), None
+    except (OSError, UnicodeDecodeError) as e:
+        logger.warning(f"Error loading holiday calendars: {e}")
+        return HolidayCalendar(), str(e)
+
+def get_holiday_calendar(directory=HOLIDAY_CALENDAR_DIR):
+    """
+    Get the organization holiday calendar, shared across sessions
+
+    The calendar is reloaded only when a file in the directory is added,
+    removed or modified.
+
+    Args:
+        directory (str): Directory containing .ics/.csv calendar files
+
+    Returns:
+        HolidayCalendar: Organization holiday calendar
+    """
+    return _load_calendar(_calendar_files(directory))[0]
+
+def get_holiday_calendar_error(directory=HOLIDAY_CALENDAR_DIR):
+    """
+    Get the error that kept the organization holiday calendar from loading
+
+    Args:
+        directory (str): Directory containing .ics/.csv calendar files
+
+    Returns:
+        str or None: Error message, or None if the calendar loaded
+    """
+    return _load_calendar(_calendar_files(directory))[1]
+
+def get_session_calendar(session_holidays):
+    """
+    Get the organization calendar with the holidays added in a session layered on top
+
+    Args:
+        session_holidays (list): Holiday objects added in the session
+
+    Returns:
+        HolidayCalendar: Calendar for the session
+    """
+    return get_holiday_calendar().with_holidays(session_holidays)
@@ -0,0 +1,225 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from config.settings import JOB_SETTINGS
+
+class JobCancelled(Exception):
+    """Raised inside a job's work when the job has been cancelled"""
+
+class Job:
+    """A unit of background work with its progress, partial rows and result"""
+
+    def __init__(self, label, key=None, owner=None):
+        self.id = uuid.uuid4().hex    # Full 128 bits, since the id in a URL grants access
+        self.label = label
+        self.key = key                # Identifies the inputs, e.g. a timesheet fingerprint
+        self.owner = owner            # Session that submitted the job
+        self.status = "queued"        # queued, running, done, failed or cancelled
+        self.progress = 0.0
+        self.message = "Queued"
+        self.rows = {}                # Partial rows as (row_data, pending), by row index
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+        self.future = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        return self.status in ("queued", "running")
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        """Ask the job to stop at its next progress or row report"""
+        self._cancel.set()
+
+    def check_cancelled(self):
+        """Raise JobCancelled if the job has been cancelled"""
+        if self._cancel.is_set():
+            raise JobCancelled(self.id)
+
+    def report_progress(self, fraction, message):
+        """
+        Record progress; usable as a progress_callback
+
+        Args:
+            fraction (float): Completed fraction between 0 and 1
+            message (str): Status message
+        """
+        self.check_cancelled()
+        self.progress = fraction
+        self.message = message
+
+    def update_row(self, index, row_data, pending):
+        """
+        Record a partial row; usable as a row_callback
+
+        Args:
+            index (int): Row index
+            row_data (list): Cell values of the row
+            pending (bool): Whether the row is still being summarized
+        """
+        self.check_cancelled()
+        with self._lock:
+            self.rows[index] = (list(row_data), pending)
+
+    def snapshot_rows(self):
+        """
+        Get the partial rows recorded so far
+
+        Returns:
+            list: (row_data, pending) pairs in row order
+        """
+        with self._lock:
+            return [self.rows[i] for i in sorted(self.rows)]
+
+class JobManager:
+    """Runs jobs on a worker pool outside the Streamlit script run and keeps their results until expiry"""
+
+    def __init__(self, workers, expiry_seconds):
+        self.expiry_seconds = expiry_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, func, label, key=None, owner=None):
+        """
+        Queue a job
+
+        Args:
+            func (callable): Work to run as func(job); its return value becomes job.result.
+                It should report through job.report_progress / job.update_row, which
+                raise JobCancelled once the job is cancelled.
+            label (str): Human readable description of the job
+            key (str, optional): Identifies the job's inputs
+            owner (str, optional): Session submitting the job
+
+        Returns:
+            Job: The queued job
+        """
+        self.expire()
+        job = Job(label, key, owner)
+        with self._lock:
+            self._jobs[job.id] = job
+        job.future = self._executor.submit(self._run, job, func)
+        return job
+
+    def _run(self, job, func):
+        if job.cancelled:
+            job.status = "cancelled"
+            job.message = "Cancelled"
+            job.finished = time.time()
+            return
+        job.status = "running"
+        job.message = "Starting"
+        try:
+            job.result = func(job)
+            job.status = "done"
+            job.progress = 1.0
+            job.message = "Done"
+        except JobCancelled:
+            job.status = "cancelled"
+            job.message = "Cancelled"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+            job.message = f"Failed: {e}"
+        finally:
+            job.finished = time.time()
+
+    def get(self, job_id):
+        """
+        Look up a job
+
+        Args:
+            job_id (str): Job id from submit
+
+        Returns:
+            Job or None: The job, or None if it is unknown or has expired
+        """
+        self.expire()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """
+        Cancel a queued or running job
+
+        A running job stops at its next progress or row report.
+
+        Args:
+            job_id (str): Job id from submit
+        """
+        job = self.get(job_id)
+        if job is None or not job.active:
+            return
+        job.cancel()
+        if job.future.cancel():
+            # Never started
+            job.status = "cancelled"
+            job.message = "Cancelled"
+            job.finished = time.time()
+
+    def expire(self):
+        """Forget finished jobs older than expiry_seconds"""
+        cutoff = time.time() - self.expiry_seconds
+        with self._lock:
+            for job_id in [job_id for job_id, job in self._jobs.items() if job.finished and job.finished < cutoff]:
+                del self._jobs[job_id]
+
+@st.cache_resource
+def get_job_manager():
+    """
+    Get the job manager shared by every session
+
+    Jobs keep running when a page is refreshed or closed.
+
+    Returns:
+        JobManager: Job manager configured from JOB_SETTINGS
+    """
+    return JobManager(JOB_SETTINGS['workers'], JOB_SETTINGS['expiry_seconds'])
+
+def get_session_id():
+    """
+    Get the id of the browser session running the current script
+
+    Returns:
+        str: Streamlit session id, or 'default' outside a script run
+    """
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx else "default"
+
+def get_session_jobs():
+    """
+    Get the jobs submitted from this browser tab
+
+    Job ids are kept in the page URL so they survive a refresh. Browser sessions
+    change on refresh, so the jobs are not tied to one: anyone with the URL can
+    view and cancel them, like a share link.
+
+    Returns:
+        list: Jobs that still exist, oldest first
+    """
+    manager = get_job_manager()
+    job_ids = st.query_params.get_all("job")
+    jobs = [job for job in (manager.get(job_id) for job_id in job_ids) if job is not None]
+    if len(jobs) != len(job_ids):
+        st.query_params["job"] = [job.id for job in jobs]
+    return jobs
+
+def add_session_job(job):
+    """
+    Remember a job as submitted from this browser tab
+
+    Args:
+        job (Job): Job returned by JobManager.submit
+    """
+    st.query_params["job"] = st.query_params.get_all("job") + [job.id]
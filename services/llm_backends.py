@@ -0,0 +1,45 @@
+from typing import Any
+from urllib.parse import urlparse
+from langchain_community.llms import Ollama
+
+class PooledOllama(Ollama):
+    """
+    Ollama LLM that sends its requests through an EndpointPool instead of a single base_url
+    
+    Also accepts a `context` keyword (the token context returned by a previous
+    call), which continues that conversation without resending it.
+    """
+    
+    pool: Any = None
+    
+    def _create_stream(self, api_url, payload, stop=None, **kwargs):
+        # Same request body as Ollama._create_stream, posted through the pool
+        context = kwargs.pop("context", None)
+        if self.stop is not None and stop is not None:
+            raise ValueError("`stop` found in both the input and default params.")
+        elif self.stop is not None:
+            stop = self.stop
+        
+        params = self._default_params
+        for key in self._default_params:
+            if key in kwargs:
+                params[key] = kwargs[key]
+        
+        if "options" in kwargs:
+            params["options"] = kwargs["options"]
+        else:
+            params["options"] = {
+                **params["options"],
+                "stop": stop,
+                **{k: v for k, v in kwargs.items() if k not in self._default_params}
+            }
+        
+        if payload.get("messages"):
+            request_payload = {"messages": payload.get("messages", []), **params}
+        else:
+            request_payload = {"prompt": payload.get("prompt"), "images": payload.get("images", []), **params}
+        if context:
+            request_payload["context"] = context
+        
+        headers = self.headers if isinstance(self.headers, dict) else None
+        return self.pool.post(urlparse(api_url).path, request_payload, headers=headers, auth=self.auth)
@@ -0,0 +1,17 @@
+from langchain.callbacks.base import BaseCallbackHandler
+
+class TokenUsageHandler(BaseCallbackHandler):
+    """Callback that captures the token counts and context Ollama reports for a call"""
+    
+    def __init__(self):
+        self.prompt_tokens = None
+        self.completion_tokens = None
+        self.context = None
+    
+    def on_llm_end(self, response, **kwargs):
+        if not response.generations or not response.generations[0]:
+            return
+        info = response.generations[0][0].generation_info or {}
+        self.prompt_tokens = info.get('prompt_eval_count')
+        self.completion_tokens = info.get('eval_count')
+        self.context = info.get('context')
@@ -1,41 +1,988 @@
-import streamlit as st
-from langchain.llms import Ollama
-from prompts.task_summarization import get_task_summarization_prompt
-from config.settings import LLM_MODEL
+import logging
+import re
+import threading
+import time
+from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from prompts.task_summarization import (
+    get_task_summarization_prompt, get_batch_summarization_prompt,
+    get_contextual_summarization_prompts, get_chunk_summarization_prompt, TASK_SUMMARIZATION_TEMPLATE,
+    BATCH_SUMMARIZATION_TEMPLATE, CONTEXTUAL_SUMMARIZATION_TEMPLATE, CONTEXTUAL_FOLLOWUP_TEMPLATE,
+    CHUNK_SUMMARIZATION_TEMPLATE
+)
+from services.cache_service import SummaryCache, get_summary_cache
+from services.scheduler_service import (
+    get_llm_scheduler, get_current_session, get_current_cancelled, set_current_session, CallCancelled
+)
+from services.profiling_service import get_current_profiler
+from utils.helpers import normalize_description, extractive_summary, count_tokens, split_into_chunks
+from utils.resources import shared_resource
+from config.settings import (
+    LLM_MODEL, LLM_MODELS, LLM_LATENCY_TARGET, LLM_MAX_CONCURRENCY, LLM_BATCH_SIZE, SUMMARY_MAX_WORDS, LLM_ENDPOINTS,
+    LLM_REQUEST_POLICY, LLM_CONTEXT_WINDOW, LLM_CONTEXTUAL, LLM_GENERATION, LLM_WARM_UP, LLM_CHUNKING
+)
 
-@st.cache_resource
-def get_llm():
+logger = logging.getLogger("timesheet.llm")
+
+# Matches one "N. summary" line of a batch response
+BATCH_LINE_PATTERN = re.compile(r"^\s*(\d+)\s*[.):-]\s*(.+?)\s*$")
+
+class OllamaEndpoint:
+    """One Ollama host with its persistent connections, current load and circuit breaker state"""
+    
+    def __init__(self, url, pool_size):
+        self.url = url.rstrip("/")
+        self.pool_size = pool_size
+        self.in_flight = 0
+        self.failures = 0          # Consecutive failed requests
+        self.open_until = 0.0      # The host is skipped until this time once its circuit opens
+        self.trial = False         # A half-open trial request is in flight
+        self._session = None
+    
+    @property
+    def session(self):
+        """requests.Session reusing keep-alive connections to this host"""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            
+            self._session = requests.Session()
+            self._session.mount(self.url, HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size))
+        return self._session
+
+class EndpointPool:
+    """
+    Routes Ollama requests across several hosts
+    
+    Each request goes to the healthy host with the fewest requests in flight.
+    Connection errors, timeouts and 5xx responses are retried on another host
+    within the request deadline. A host that fails failure_threshold times in a
+    row is skipped for cooldown_seconds, after which a single trial request
+    decides whether it is used again.
+    """
+    
+    def __init__(self, endpoints, pool_size=LLM_MAX_CONCURRENCY, connect_timeout=5, request_timeout=120,
+                 max_retries=2, failure_threshold=3, cooldown_seconds=30):
+        if not endpoints:
+            raise ValueError("At least one Ollama endpoint is required")
+        self.endpoints = [OllamaEndpoint(url, pool_size) for url in endpoints]
+        self.connect_timeout = connect_timeout
+        self.request_timeout = request_timeout
+        self.max_retries = max_retries
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
+    
+    def _acquire(self, exclude=()):
+        with self._lock:
+            now = time.monotonic()
+            candidates = []
+            for endpoint in self.endpoints:
+                if endpoint in exclude or endpoint.open_until > now:
+                    continue
+                # Only one trial request at a time for a host whose cooldown has elapsed
+                if endpoint.failures >= self.failure_threshold and endpoint.trial:
+                    continue
+                candidates.append(endpoint)
+            if not candidates:
+                return None
+            endpoint = min(candidates, key=lambda candidate: candidate.in_flight)
+            endpoint.in_flight += 1
+            if endpoint.failures >= self.failure_threshold:
+                endpoint.trial = True
+            return endpoint
+    
+    def _release(self, endpoint, ok):
+        with self._lock:
+            endpoint.in_flight -= 1
+            endpoint.trial = False
+            if ok is None:
+                return  # Outcome says nothing about the host's health
+            if ok:
+                endpoint.failures = 0
+            else:
+                endpoint.failures += 1
+                if endpoint.failures >= self.failure_threshold:
+                    endpoint.open_until = time.monotonic() + self.cooldown_seconds
+    
+    def post(self, path, payload, headers=None, auth=None):
+        """
+        POST a streaming request to the least-loaded healthy host
+        
+        Args:
+            path (str): API path, e.g. '/api/generate'
+            payload (dict): JSON request body
+            headers (dict, optional): Extra request headers
+            auth (optional): requests authentication
+        
+        Returns:
+            iterator: Decoded response lines. Errors after the response has started
+                are not retried, since part of it may already have been consumed.
+        """
+        import requests
+        
+        deadline = time.monotonic() + self.request_timeout
+        tried = []
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            # Prefer a host not tried yet, but retry a tried one rather than give up
+            endpoint = self._acquire(exclude=tried) or self._acquire()
+            if endpoint is None:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._release(endpoint, None)
+                raise TimeoutError(f"Ollama request exceeded {self.request_timeout} s")
+            try:
+                response = endpoint.session.post(
+                    endpoint.url + path,
+                    json=payload,
+                    headers={"Content-Type": "application/json", **(headers or {})},
+                    auth=auth,
+                    stream=True,
+                    timeout=(min(self.connect_timeout, remaining), remaining)
+                )
+            except requests.RequestException as e:
+                last_error = e
+            else:
+                if response.status_code == 200:
+                    response.encoding = "utf-8"
+                    return self._iter_lines(endpoint, response, deadline)
+                detail = response.text
+                response.close()
+                if response.status_code < 500:
+                    # The host is healthy; the request itself is wrong (e.g. unknown model)
+                    self._release(endpoint, True)
+                    raise ValueError(f"Ollama call failed with status code {response.status_code}. Details: {detail}")
+                last_error = ValueError(f"Ollama call to {endpoint.url} failed with status code {response.status_code}")
+            self._release(endpoint, False)
+            tried.append(endpoint)
+            
+            # Brief exponential backoff before the next attempt
+            time.sleep(min(0.1 * 2 ** attempt, max(0.0, deadline - time.monotonic())))
+        
+        if last_error is None:
+            raise ConnectionError("No Ollama endpoint is available (all circuits are open)")
+        raise ConnectionError(f"Ollama request failed after {len(tried)} attempt(s): {last_error}")
+    
+    def _iter_lines(self, endpoint, response, deadline):
+        ok = False
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Ollama request exceeded {self.request_timeout} s")
+                yield line
+            ok = True
+        except GeneratorExit:
+            ok = None  # Abandoned by the caller, not a host failure
+            raise
+        finally:
+            response.close()
+            self._release(endpoint, ok)
+    
+    def status(self):
+        """
+        Get the current state of every host
+        
+        Returns:
+            list: Dictionaries with 'url', 'in_flight', 'failures' and 'open' keys
+        """
+        with self._lock:
+            now = time.monotonic()
+            return [
+                {
+                    'url': endpoint.url,
+                    'in_flight': endpoint.in_flight,
+                    'failures': endpoint.failures,
+                    'open': endpoint.open_until > now
+                }
+                for endpoint in self.endpoints
+            ]
+
+@shared_resource
+def get_endpoint_pool():
+    """
+    Get the Ollama endpoint pool shared by every session
+    
+    Returns:
+        EndpointPool: Pool over LLM_ENDPOINTS using LLM_REQUEST_POLICY
+    """
+    return EndpointPool(LLM_ENDPOINTS, pool_size=LLM_MAX_CONCURRENCY, **LLM_REQUEST_POLICY)
+
+def _invoke_with_metrics(chain, inputs, prompt_text, metrics, descriptions=1, on_token=None, usage=None, model=None,
+                         max_words=None):
+    """
+    Invoke a summarization chain, recording its timing and token usage
+    
+    The call waits for a slot of the shared LLM scheduler first, giving up with
+    CallCancelled if the thread's calls are cancelled meanwhile; the wait is
+    recorded as the 'queue' stage. With max_words the response is streamed and
+    reading stops once it passes the limit, which closes the request so Ollama
+    stops generating; the response is then cut back to whole sentences within
+    the limit.
+    
+    Args:
+        chain (Runnable): Prompt | LLM chain to invoke
+        inputs (dict): Prompt variables
+        prompt_text (str): Rendered prompt, used for size accounting
+        metrics (RunMetrics or None): Metrics collector for the current run
+        descriptions (int): Number of descriptions covered by the call
+        on_token (callable, optional): Streams the response; called with the text
+            generated so far each time new tokens arrive
+        usage (TokenUsageHandler, optional): Handler to collect the call's usage and context into
+        model (str, optional): Model behind the chain; its latency is reported to the model router
+        max_words (int, optional): Word limit to stop generation at
+        
+    Returns:
+        str: Raw model response
+    """
+    from services.llm_callbacks import TokenUsageHandler
+    
+    usage = usage or TokenUsageHandler()
+    config = {"callbacks": [usage]}
+    with get_llm_scheduler().slot(get_current_session(), get_current_cancelled()) as waited:
+        start = time.perf_counter()
+        chunks = 0
+        if on_token or max_words:
+            response = ""
+            for chunk in chain.stream(inputs, config=config):
+                response += chunk
+                chunks += 1
+                if on_token:
+                    on_token(response)
+                if max_words and len(response.split()) > max_words:
+                    response = extractive_summary(response, max_words)
+                    break
+        else:
+            response = chain.invoke(inputs, config=config)
+    seconds = time.perf_counter() - start
+    if model:
+        get_model_router().observe(model, seconds)
+    if metrics:
+        metrics.add_stage_time("queue", waited)
+        metrics.record_llm_call(
+            seconds,
+            prompt_chars=len(prompt_text),
+            response_chars=len(response),
+            prompt_tokens=usage.prompt_tokens,
+            # Ollama only reports counts at the end, so a cut-off stream counts its chunks (one token each)
+            completion_tokens=usage.completion_tokens or chunks,
+            descriptions=descriptions,
+            model=model
+        )
+    return response
+
+class SingleFlight:
+    """Lets concurrent callers with the same key share one in-flight computation"""
+    
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+    
+    def do(self, key, func):
+        """
+        Run func, unless a call with the same key is already in flight, in which case wait for its result
+        
+        Args:
+            key (str): Identifies the computation
+            func (callable): Computation to run without arguments
+        
+        Returns:
+            tuple: (result, whether it was shared from another caller's call).
+                An exception raised by func is re-raised for every caller, unless the
+                caller that ran it was cancelled (e.g. its job was cancelled while
+                streaming); waiting callers then run func again themselves.
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = Future()
+            if leader:
+                break
+            try:
+                return call.result(), True
+            except CallCancelled:
+                continue  # The leader's caller gave up; retry, as the leader if nobody else has started
+        
+        try:
+            result = func()
+        except BaseException as e:
+            cancelled = get_current_cancelled()
+            if isinstance(e, CallCancelled) or (cancelled is not None and cancelled()):
+                # The failure belongs to this caller, not to the computation
+                shared = CallCancelled(f"Shared call was cancelled by its caller: {e}")
+            else:
+                shared = e
+            with self._lock:
+                del self._calls[key]
+            call.set_exception(shared)
+            raise
+        with self._lock:
+            del self._calls[key]
+        call.set_result(result)
+        return result, False
+
+@shared_resource
+def get_single_flight():
+    """
+    Get the in-flight summarization registry shared by every session
+    
+    Returns:
+        SingleFlight: Registry keyed by summary cache key
+    """
+    return SingleFlight()
+
+class ModelRouter:
+    """
+    Picks the model for each summary by description length and observed latency
+    
+    Models are listed fastest first. A description goes to the first model whose
+    'max_words' covers it; if that model's recent average latency exceeds the
+    call's latency budget, the next faster model is tried instead. A skipped model
+    gets no new calls to measure, so its average is halved for every
+    stale_half_life seconds since its last call; once that drops within budget the
+    model is tried again, and new calls update the decayed average.
+    """
+    
+    def __init__(self, models, smoothing=0.3, stale_half_life=120):
+        self.models = models
+        self.smoothing = smoothing              # Weight of the newest call in the moving average
+        self.stale_half_life = stale_half_life  # Seconds after which an unrefreshed average counts half
+        self.latency = {}                       # Model name -> exponentially weighted seconds per call
+        self.observed = {}                      # Model name -> time.monotonic() of its last call
+        self._lock = threading.Lock()
+    
+    @property
+    def names(self):
+        return [model['name'] for model in self.models]
+    
+    def observe(self, model, seconds):
+        """
+        Record the latency of a call
+        
+        Args:
+            model (str): Model name
+            seconds (float): Wall time of the call
+        """
+        now = time.monotonic()
+        with self._lock:
+            previous = self._expected_latency(model, now) if model in self.latency else None
+            self.latency[model] = seconds if previous is None else previous + self.smoothing * (seconds - previous)
+            self.observed[model] = now
+    
+    def _expected_latency(self, model, now):
+        latency = self.latency.get(model)
+        if latency is None:
+            return 0.0
+        return latency * 0.5 ** ((now - self.observed[model]) / self.stale_half_life)
+    
+    def choose(self, words, latency_budget=None):
+        """
+        Pick a model
+        
+        Args:
+            words (int): Length of the longest description to summarize, in words
+            latency_budget (float, optional): Seconds the call should take
+        
+        Returns:
+            str: Model name
+        """
+        index = next(
+            (i for i, model in enumerate(self.models) if model['max_words'] is None or words <= model['max_words']),
+            len(self.models) - 1
+        )
+        if latency_budget is not None:
+            now = time.monotonic()
+            with self._lock:
+                while index > 0 and self._expected_latency(self.models[index]['name'], now) > latency_budget:
+                    index -= 1
+        return self.models[index]['name']
+    
+    def status(self):
+        """
+        Get the observed latency of each model
+        
+        Returns:
+            dict: Model name -> average seconds per call, or None if not used yet
+        """
+        with self._lock:
+            return {name: self.latency.get(name) for name in self.names}
+
+@shared_resource
+def get_model_router():
+    """
+    Get the model router shared by every session
+    
+    Returns:
+        ModelRouter: Router over LLM_MODELS
+    """
+    return ModelRouter(LLM_MODELS or [{'name': LLM_MODEL, 'max_words': None}])
+
+@shared_resource
+def get_llm(model=LLM_MODEL):
     """
     Initialize and cache LLM model
     
+    Args:
+        model (str): Ollama model name
+    
     Returns:
-        Ollama or None: Initialized LLM model or None if initialization fails
+        PooledOllama or None: Initialized LLM model or None if initialization fails
     """
+    # Imported lazily so the app starts without loading langchain
+    from services.llm_backends import PooledOllama
+    
     try:
-        return Ollama(model=LLM_MODEL)
+        return PooledOllama(
+            model=model,
+            pool=get_endpoint_pool(),
+            keep_alive=LLM_GENERATION['keep_alive'],
+            num_predict=LLM_GENERATION['max_tokens']
+        )
     except Exception as e:
-        st.error(f"Error initializing LLM: {e}")
+        logger.error(f"Error initializing LLM: {e}")
+        return None
+
+def warm_up_models():
+    """
+    Load the summarization models into memory on every Ollama host
+    
+    Sends Ollama's load request (a generate request without a prompt) with the
+    configured keep_alive, so the next summaries do not wait for the model to load.
+    
+    Returns:
+        dict: (host, model) -> seconds the load took, or the error message if it failed
+    """
+    pool = get_endpoint_pool()
+    models = get_model_router().names
+    if LLM_CONTEXTUAL and LLM_MODEL not in models:
+        models.append(LLM_MODEL)
+    
+    results = {}
+    for endpoint in pool.endpoints:
+        for model in models:
+            start = time.perf_counter()
+            try:
+                response = endpoint.session.post(
+                    f"{endpoint.url}/api/generate",
+                    json={"model": model, "keep_alive": LLM_GENERATION['keep_alive']},
+                    timeout=(pool.connect_timeout, pool.request_timeout)
+                )
+                response.raise_for_status()
+                results[(endpoint.url, model)] = time.perf_counter() - start
+            except Exception as e:
+                logger.warning(f"Could not warm up {model} on {endpoint.url}: {e}")
+                results[(endpoint.url, model)] = str(e)
+    return results
+
+@shared_resource
+def start_warm_up():
+    """
+    Start warming up the models in the background, once per process
+    
+    The models are loaded right away and again every LLM_WARM_UP['interval_seconds']
+    within LLM_WARM_UP['working_hours'], so they stay resident while people work.
+    
+    Returns:
+        threading.Thread or None: The warm-up thread, or None if warm-up is disabled
+    """
+    if not LLM_WARM_UP['enabled']:
         return None
+    
+    def run():
+        start_hour, end_hour = LLM_WARM_UP['working_hours']
+        warm_up_models()
+        while True:
+            time.sleep(LLM_WARM_UP['interval_seconds'])
+            if start_hour <= datetime.now().hour < end_hour:
+                warm_up_models()
+    
+    thread = threading.Thread(target=run, name="llm-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+def _summary_llm(llm):
+    """
+    Apply the single-summary output controls to an LLM
+    
+    Args:
+        llm (PooledOllama): LLM from get_llm
+    
+    Returns:
+        tuple: (runnable to chain after the prompt, word limit to stop generation at or None)
+    """
+    max_words = SUMMARY_MAX_WORDS if LLM_GENERATION['stop_at_word_limit'] else None
+    if LLM_GENERATION['stop']:
+        llm = llm.bind(stop=LLM_GENERATION['stop'])
+    return llm, max_words
+
+def _get_cached(cache, template, normalized, model):
+    """
+    Look up a cached summary, preferring the routed model's but accepting any configured model's
+    
+    Args:
+        cache (SummaryCache): Summary cache
+        template (str): Prompt template the summary was made with
+        normalized (str): Normalized task description
+        model (str): Routed model
+    
+    Returns:
+        tuple: (summary or None, model that produced it)
+    """
+    for name in [model] + [name for name in get_model_router().names if name != model]:
+        summary = cache.get(SummaryCache.make_key(name, template, normalized))
+        if summary is not None:
+            return summary, name
+    return None, model
+
+def is_long_description(description):
+    """
+    Check whether a description is too long to summarize in a single prompt
+    
+    Args:
+        description (str): Task description
+        
+    Returns:
+        bool: Whether its locally counted tokens exceed LLM_CHUNKING['threshold_tokens']
+    """
+    return count_tokens(description) > LLM_CHUNKING['threshold_tokens']
+
+def _worker_initializer():
+    """
+    Build a thread initializer that lets worker threads queue their LLM calls under the calling thread's
+    session and cancellation check
+    
+    Returns:
+        callable: Initializer for a ThreadPoolExecutor
+    """
+    session = get_current_session()
+    cancelled = get_current_cancelled()
+    
+    def attach_session():
+        set_current_session(session, cancelled)
+    return attach_session
 
-def summarize_task(description):
+def condense_description(description, llm, model, metrics=None):
+    """
+    Shorten a description that is too long for one prompt by summarizing it in chunks
+    
+    The description is split at sentence ends into chunks of at most
+    LLM_CHUNKING['chunk_tokens'] tokens, which are summarized concurrently. While
+    the joined chunk summaries are still over the threshold they are chunked and
+    summarized again, so the final summary prompt sees every part of the day
+    instead of an overflowing or truncated description.
+    
+    Args:
+        description (str): Long task description
+        llm (PooledOllama): LLM from get_llm
+        model (str): Model behind llm, part of the chunk summaries' cache keys
+        metrics (RunMetrics, optional): Metrics collector for the current run
+        
+    Returns:
+        str: Joined chunk summaries, or the description if it already fits
+    """
+    text = description
+    total_chunks = 0
+    while count_tokens(text) > LLM_CHUNKING['threshold_tokens']:
+        chunks = split_into_chunks(text, LLM_CHUNKING['chunk_tokens'])
+        condensed = " ".join(_summarize_chunks(chunks, llm, model, metrics))
+        total_chunks += len(chunks)
+        if count_tokens(condensed) >= count_tokens(text):
+            break  # Summaries are not getting any shorter; summarize what there is
+        text = condensed
+    if metrics and total_chunks:
+        metrics.record_chunks(total_chunks)
+    return text
+
+def _summarize_chunks(chunks, llm, model, metrics):
+    """
+    Summarize the chunks of a long description concurrently
+    
+    Returns:
+        list: Chunk summaries in chunk order
+    """
+    prompt = get_chunk_summarization_prompt()
+    # A chunk summary may run to a few sentences, longer than the single-summary cap
+    # on llm, but never needs more tokens than the chunk itself
+    chain = prompt | llm.bind(num_predict=LLM_CHUNKING['chunk_tokens'])
+    cache = get_summary_cache()
+    
+    def summarize_chunk(index):
+        inputs = {"part": index + 1, "parts": len(chunks), "chunk": chunks[index]}
+        cache_key = SummaryCache.make_key(
+            model, CHUNK_SUMMARIZATION_TEMPLATE, f"{index + 1}/{len(chunks)}", normalize_description(chunks[index])
+        )
+        summary = cache.get(cache_key) if cache else None
+        if summary is not None:
+            if metrics:
+                metrics.record_llm_call(0.0, cache_hit=True)
+            return summary
+        summary = _invoke_with_metrics(chain, inputs, prompt.format(**inputs), metrics, model=model).strip()
+        if cache:
+            cache.set(cache_key, summary)
+        return summary
+    
+    profiler = get_current_profiler()
+    if profiler is not None:
+        summarize_chunk = profiler.wrap(summarize_chunk)
+    
+    executor = ThreadPoolExecutor(max_workers=max(1, min(LLM_MAX_CONCURRENCY, len(chunks))),
+                                  initializer=_worker_initializer())
+    try:
+        return list(executor.map(summarize_chunk, range(len(chunks))))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def summarize_task(description, metrics=None, on_token=None, latency_budget=None):
     """
     Summarize a task description using the LLM
     
     Args:
         description (str): Task description to summarize
+        metrics (RunMetrics, optional): Metrics collector for the current run; also
+            records which model produced the summary
+        on_token (callable, optional): Use Ollama's streaming mode and call
+            on_token(text_so_far) as tokens arrive
+        latency_budget (float, optional): Seconds the call should take, used to pick the model
         
     Returns:
         str: Summarized task description, or original if summarization fails
     """
-    llm = get_llm()
-    if not llm or not description:
+    if not description:
         return description
+    
+    model = get_model_router().choose(len(description.split()), latency_budget)
+    chunked = is_long_description(description)
+    
+    # Summaries are keyed by model and prompt so changing either invalidates them
+    template = CHUNK_SUMMARIZATION_TEMPLATE + TASK_SUMMARIZATION_TEMPLATE if chunked else TASK_SUMMARIZATION_TEMPLATE
+    cache = get_summary_cache()
+    normalized = normalize_description(description)
+    cache_key = SummaryCache.make_key(model, template, normalized)
+    if cache:
+        cached, cached_model = _get_cached(cache, template, normalized, model)
+        if cached is not None:
+            if metrics:
+                metrics.record_llm_call(0.0, cache_hit=True)
+                metrics.record_model(description, cached_model)
+            return cached
+    
+    llm = get_llm(model)
+    if not llm:
+        return description
+    
+    def call_llm():
+        prompt = get_task_summarization_prompt()
+        summary_llm, max_words = _summary_llm(llm)
+        summarize_chain = prompt | summary_llm
+        # A description too long for one prompt is summarized from its chunk summaries
+        text = condense_description(description, llm, model, metrics) if chunked else description
+        inputs = {"description": text}
+        summary = _invoke_with_metrics(
+            summarize_chain, inputs, prompt.format(**inputs), metrics, on_token=on_token, model=model,
+            max_words=max_words
+        ).strip()
+        if cache:
+            cache.set(cache_key, summary)
+        return summary
+    
+    try:
+        # Identical descriptions being summarized at the same time, in any session, share one call
+        summary, shared = get_single_flight().do(cache_key, call_llm)
+        if metrics:
+            if shared:
+                metrics.record_llm_call(0.0, coalesced=True)
+            metrics.record_model(description, model)
+        return summary
+    except Exception as e:
+        logger.warning(f"Error summarizing task: {e}")
+        return description  # Fallback to original description
+
+def parse_batch_summaries(response, count, max_words=SUMMARY_MAX_WORDS):
+    """
+    Parse a numbered batch response into individual summaries
+    
+    Args:
+        response (str): Raw LLM response with one "N. summary" line per description
+        count (int): Number of descriptions in the batch
+        max_words (int): Maximum number of words allowed per summary
+        
+    Returns:
+        dict: Mapping of zero-based batch index to summary for every valid line
+    """
+    summaries = {}
+    for line in response.splitlines():
+        match = BATCH_LINE_PATTERN.match(line)
+        if not match:
+            continue
+        index = int(match.group(1)) - 1
+        summary = match.group(2)
+        
+        # Reject out-of-range, repeated and over-long entries
+        if not 0 <= index < count or index in summaries:
+            continue
+        if len(summary.split()) > max_words:
+            continue
+        summaries[index] = summary
+    return summaries
+
+def summarize_task_batch(descriptions, metrics=None, latency_budget=None):
+    """
+    Summarize several task descriptions with a single LLM call
+    
+    Args:
+        descriptions (list): Task descriptions to summarize
+        metrics (RunMetrics, optional): Metrics collector for the current run
+        latency_budget (float, optional): Seconds the call should take, used to pick the model
+        
+    Returns:
+        list: Summaries in the same order; entries the batch response could not
+            provide are summarized individually with summarize_task
+    """
+    # The whole batch goes to one model, picked for its longest description
+    model = get_model_router().choose(max(len(description.split()) for description in descriptions), latency_budget)
+    summaries = [None] * len(descriptions)
+    cache = get_summary_cache()
+    normalized = [normalize_description(description) for description in descriptions]
+    cache_keys = [SummaryCache.make_key(model, BATCH_SUMMARIZATION_TEMPLATE, text) for text in normalized]
+    
+    # Only send descriptions that are not cached yet
+    missing = []
+    for i, description in enumerate(descriptions):
+        cached, cached_model = _get_cached(cache, BATCH_SUMMARIZATION_TEMPLATE, normalized[i], model) if cache else (None, model)
+        if cached is not None:
+            summaries[i] = cached
+            if metrics:
+                metrics.record_llm_call(0.0, cache_hit=True)
+                metrics.record_model(description, cached_model)
+        else:
+            missing.append(i)
+    
+    llm = get_llm(model)
+    if llm and len(missing) > 1:
+        try:
+            prompt = get_batch_summarization_prompt()
+            batch_llm = llm
+            if LLM_GENERATION['max_tokens']:
+                # The token cap is per summary, so scale it to the batch
+                batch_llm = llm.bind(num_predict=LLM_GENERATION['max_tokens'] * len(missing))
+            summarize_chain = prompt | batch_llm
+            numbered = "\n".join(
+                f"{n}. {' '.join(descriptions[i].split())}" for n, i in enumerate(missing, start=1)
+            )
+            inputs = {"count": len(missing), "descriptions": numbered}
+            response = _invoke_with_metrics(
+                summarize_chain, inputs, prompt.format(**inputs), metrics, descriptions=len(missing), model=model
+            )
+            for n, summary in parse_batch_summaries(response, len(missing)).items():
+                i = missing[n]
+                summaries[i] = summary
+                if cache:
+                    cache.set(cache_keys[i], summary)
+                if metrics:
+                    metrics.record_model(descriptions[i], model)
+        except Exception as e:
+            logger.warning(f"Error summarizing task batch: {e}")
+    
+    # Fall back to per-row summarization for anything the batch did not cover
+    for i, summary in enumerate(summaries):
+        if summary is None:
+            summaries[i] = summarize_task(descriptions[i], metrics, latency_budget=latency_budget)
+    return summaries
+
+def iter_summaries(descriptions, max_workers=LLM_MAX_CONCURRENCY, batch_size=LLM_BATCH_SIZE, metrics=None,
+                   on_token=None, deadline=None):
+    """
+    Summarize several task descriptions concurrently
+    
+    Descriptions that are identical after normalization are summarized once.
+    
+    Args:
+        descriptions (dict): Mapping of key to task description
+        max_workers (int): Maximum number of LLM calls in flight at once
+        batch_size (int): Number of descriptions per LLM call (1 disables batching)
+        metrics (RunMetrics, optional): Metrics collector for the current run
+        on_token (callable, optional): Stream unbatched summaries, calling
+            on_token(key, text_so_far) from the worker threads as tokens arrive
+        deadline (float, optional): time.monotonic() value to stop waiting at. Calls already
+            running finish in the background and still fill the summary cache.
+        
+    Yields:
+        tuple: (key, summary) pairs in completion order, with a None summary for
+            every key still unfinished at the deadline
+    """
+    if not descriptions:
+        return
+    
+    # Summarize each distinct description once and share the result with its duplicates
+    groups = {}
+    for key, description in descriptions.items():
+        groups.setdefault(normalize_description(description), []).append(key)
+    duplicates = {group[0]: group[1:] for group in groups.values()}
+    
+    # Long descriptions are summarized in chunks on their own instead of filling up a batch prompt
+    batch_size = max(1, batch_size)
+    batches, batch = [], []
+    for key in duplicates:
+        if batch_size > 1 and is_long_description(descriptions[key]):
+            batches.append([key])
+            continue
+        batch.append(key)
+        if len(batch) == batch_size:
+            batches.append(batch)
+            batch = []
+    if batch:
+        batches.append(batch)
+    
+    # Spread the latency target over the calls, max_workers of which run at once
+    latency_budget = LLM_LATENCY_TARGET * max(1, max_workers) / len(batches) if LLM_LATENCY_TARGET else None
+    
+    def summarize_batch(batch):
+        if len(batch) == 1:
+            key = batch[0]
+            if on_token:
+                def stream(text):
+                    for target in [key] + duplicates[key]:
+                        on_token(target, text)
+            else:
+                stream = None
+            return [summarize_task(descriptions[key], metrics, stream, latency_budget)]
+        return summarize_task_batch([descriptions[key] for key in batch], metrics, latency_budget)
+    
+    # When the caller is being profiled, profile the LLM calls in the worker threads too
+    profiler = get_current_profiler()
+    if profiler is not None:
+        summarize_batch = profiler.wrap(summarize_batch)
+    
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers), initializer=_worker_initializer())
+    try:
+        futures = {executor.submit(summarize_batch, batch): batch for batch in batches}
+        unfinished = set(futures)
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                unfinished.discard(future)
+                batch = futures[future]
+                try:
+                    summaries = future.result()
+                except Exception:
+                    summaries = [descriptions[key] for key in batch]  # Fallback to original descriptions
+                for key, summary in zip(batch, summaries):
+                    yield key, summary
+                    for duplicate in duplicates[key]:
+                        if metrics:
+                            metrics.record_llm_call(0.0, coalesced=True)
+                        yield duplicate, summary
+        except FuturesTimeoutError:  # Not the built-in TimeoutError before Python 3.11
+            for future in unfinished:
+                for key in futures[future]:
+                    for late in [key] + duplicates[key]:
+                        yield late, None
+    finally:
+        # Drop queued requests if the consumer stops early, e.g. when a job is cancelled
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def iter_contextual_summaries(descriptions, window=LLM_CONTEXT_WINDOW, metrics=None, on_token=None, deadline=None):
+    """
+    Summarize task descriptions in order, giving the model the previous days as context
+    
+    The first day of a chain is prompted with the summaries of up to `window`
+    previous days. Following days send only their own description together with
+    the token context Ollama returned for the previous call, so the history is
+    not re-sent and re-processed each time. The chain is restarted from the
+    latest summaries every `window` days, after a cache hit or after an error,
+    which keeps the carried context bounded. The carried context only makes sense
+    to the model that produced it, so every day uses LLM_MODEL without routing.
+    
+    Args:
+        descriptions (dict): Mapping of key to task description, in date order
+        window (int): Number of previous days kept as context
+        metrics (RunMetrics, optional): Metrics collector for the current run
+        on_token (callable, optional): Stream summaries, calling on_token(key, text_so_far)
+        deadline (float, optional): time.monotonic() value after which no new calls are started
         
+    Yields:
+        tuple: (key, summary) pairs in the order of descriptions, with a None summary
+            for every day not started before the deadline
+    """
+    window = max(1, window)
+    cache = get_summary_cache()
+    history = []      # (description, summary) of the previous days
+    context = None    # Ollama token context of the current chain
+    chain_days = 0
+    
+    for key, description in descriptions.items():
+        if deadline is not None and time.monotonic() >= deadline:
+            yield key, None
+            continue
+        previous = history[-window:]
+        
+        # The summary depends on the previous days too, so they are part of the cache key
+        cache_key = SummaryCache.make_key(
+            LLM_MODEL, CONTEXTUAL_SUMMARIZATION_TEMPLATE, CONTEXTUAL_FOLLOWUP_TEMPLATE,
+            *(normalize_description(desc) for desc, _ in previous), normalize_description(description)
+        )
+        summary = cache.get(cache_key) if cache else None
+        if summary is not None:
+            if metrics:
+                metrics.record_llm_call(0.0, cache_hit=True)
+                metrics.record_model(description, LLM_MODEL)
+            context = None
+        else:
+            if chain_days >= window:
+                # Restart from the latest summaries to keep the carried context bounded
+                context = None
+                chain_days = 0
+            stream = (lambda text: on_token(key, text)) if on_token else None
+            summary, context = _summarize_in_context(description, previous, context, metrics, stream)
+            # A summary equal to the description is the fallback after an LLM error
+            if cache and summary != description:
+                cache.set(cache_key, summary)
+        chain_days = chain_days + 1 if context is not None else 0
+        history.append((description, summary))
+        yield key, summary
+
+def _summarize_in_context(description, previous, context, metrics, on_token):
+    """
+    Summarize one day of a contextual chain
+    
+    Returns:
+        tuple: (summary, Ollama context to continue the chain with, or None to restart it)
+    """
+    from services.llm_callbacks import TokenUsageHandler
+    
+    llm = get_llm()
+    if not llm:
+        return description, None
+    
     try:
-        prompt = get_task_summarization_prompt()
-        summarize_chain = prompt | llm
-        summary = summarize_chain.invoke({"description": description})
-        return summary.strip()
+        start_prompt, followup_prompt = get_contextual_summarization_prompts()
+        summary_llm, max_words = _summary_llm(llm)
+        if is_long_description(description):
+            description_text = condense_description(description, llm, LLM_MODEL, metrics)
+        else:
+            description_text = description
+        if context:
+            prompt = followup_prompt
+            inputs = {"description": description_text}
+            chain = prompt | summary_llm.bind(context=context)
+        else:
+            prompt = start_prompt
+            history = "\n".join(f"- {summary}" for _, summary in previous) or "- (none)"
+            inputs = {"description": description_text, "history": history}
+            chain = prompt | summary_llm
+        # A summary cut off at the word limit reports no context, which restarts the chain
+        usage = TokenUsageHandler()
+        summary = _invoke_with_metrics(
+            chain, inputs, prompt.format(**inputs), metrics, on_token=on_token, usage=usage, model=LLM_MODEL,
+            max_words=max_words
+        ).strip()
+        if metrics:
+            metrics.record_model(description, LLM_MODEL)
+        return summary, usage.context
     except Exception as e:
-        st.warning(f"Error summarizing task: {e}")
-        return description  # Fallback to original description
\ No newline at end of file
+        logger.warning(f"Error summarizing task: {e}")
+        return description, None  # Fallback to original description
@@ -0,0 +1,272 @@
+import json
+import os
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from utils.helpers import normalize_description
+from config.settings import METRICS_FILE
+
+logger = logging.getLogger("timesheet.metrics")
+
+class RunMetrics:
+    """Per-stage timings and LLM call statistics for one timesheet generation"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.stages = {}
+        self.llm_calls = []
+        self.models = {}    # Normalized description -> model that produced its summary
+        self.first_row_seconds = None
+        self.chunked = {'descriptions': 0, 'chunks': 0}   # Long descriptions summarized in chunks
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Time a block of code and add it to the named stage
+
+        Args:
+            name (str): Stage name, e.g. 'parse' or 'save'
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage_time(name, time.perf_counter() - start)
+
+    def add_stage_time(self, name, seconds):
+        with self._lock:
+            stage = self.stages.setdefault(name, {'seconds': 0.0, 'count': 0})
+            stage['seconds'] += seconds
+            stage['count'] += 1
+
+    def record_llm_call(self, seconds, prompt_chars=0, response_chars=0, prompt_tokens=None,
+                        completion_tokens=None, cache_hit=False, coalesced=False, descriptions=1, model=None):
+        """
+        Record one summarization call
+
+        Args:
+            seconds (float): Wall time of the call
+            prompt_chars (int): Size of the prompt sent to the model
+            response_chars (int): Size of the model response
+            prompt_tokens (int, optional): Prompt tokens reported by Ollama
+            completion_tokens (int, optional): Generated tokens reported by Ollama
+            cache_hit (bool): Whether the summary came from the cache instead of the model
+            coalesced (bool): Whether the summary was shared from an identical request
+                instead of calling the model
+            descriptions (int): Number of descriptions covered by the call
+            model (str, optional): Model that answered the call
+        """
+        with self._lock:
+            self.llm_calls.append({
+                'seconds': seconds,
+                'prompt_chars': prompt_chars,
+                'response_chars': response_chars,
+                'prompt_tokens': prompt_tokens or 0,
+                'completion_tokens': completion_tokens or 0,
+                'cache_hit': cache_hit,
+                'coalesced': coalesced,
+                'descriptions': descriptions,
+                'model': model
+            })
+
+    def record_chunks(self, chunks):
+        """
+        Record a long description that was summarized in chunks
+
+        Args:
+            chunks (int): Number of chunks summarized, over every pass
+        """
+        with self._lock:
+            self.chunked['descriptions'] += 1
+            self.chunked['chunks'] += chunks
+
+    def mark_first_row(self):
+        """Record the time until the first summarized row was ready, if not recorded yet"""
+        with self._lock:
+            if self.first_row_seconds is None:
+                self.first_row_seconds = time.perf_counter() - self._start
+
+    def record_model(self, description, model):
+        """
+        Record which model produced the summary of a description
+
+        Args:
+            description (str): Task description
+            model (str): Model name
+        """
+        with self._lock:
+            self.models[normalize_description(description)] = model
+
+    def model_for(self, description):
+        """
+        Get the model recorded for a description's summary
+
+        Args:
+            description (str): Task description
+
+        Returns:
+            str or None: Model name, or None if none was recorded
+        """
+        with self._lock:
+            return self.models.get(normalize_description(description))
+
+    def summary(self):
+        """
+        Summarize the run as a JSON-serializable dictionary
+
+        Returns:
+            dict: Total wall time, per-stage timings and aggregated LLM statistics
+        """
+        with self._lock:
+            calls = list(self.llm_calls)
+            stages = {name: dict(stage) for name, stage in self.stages.items()}
+            chunked = dict(self.chunked)
+
+        model_calls = [call for call in calls if not call['cache_hit'] and not call['coalesced']]
+        models = {}
+        for call in model_calls:
+            if call['model']:
+                model = models.setdefault(call['model'], {'calls': 0, 'seconds': 0.0})
+                model['calls'] += 1
+                model['seconds'] += call['seconds']
+        return {
+            'started': self.started,
+            'total_seconds': time.perf_counter() - self._start,
+            'first_row_seconds': self.first_row_seconds,
+            'stages': stages,
+            'llm': {
+                'calls': len(model_calls),
+                'cache_hits': sum(1 for call in calls if call['cache_hit']),
+                'coalesced': sum(1 for call in calls if call['coalesced']),
+                'seconds': sum(call['seconds'] for call in model_calls),
+                'max_seconds': max((call['seconds'] for call in model_calls), default=0.0),
+                'prompt_chars': sum(call['prompt_chars'] for call in model_calls),
+                'response_chars': sum(call['response_chars'] for call in model_calls),
+                'prompt_tokens': sum(call['prompt_tokens'] for call in model_calls),
+                'completion_tokens': sum(call['completion_tokens'] for call in model_calls),
+                'models': models,
+                'chunked': chunked
+            }
+        }
+
+    def finish(self, **labels):
+        """
+        Emit the run as a structured JSON log line and add it to the process-wide totals
+
+        Args:
+            **labels: Extra fields to include in the log line (e.g. employee_id)
+
+        Returns:
+            dict: The run summary
+        """
+        summary = self.summary()
+        summary.update(labels)
+        logger.info(json.dumps(summary))
+        _record_totals(summary)
+        return summary
+
+# Process-wide totals exported in Prometheus text format
+_totals = {
+    'runs': 0,
+    'run_seconds': 0.0,
+    'stage_seconds': {},
+    'llm_calls': 0,
+    'llm_cache_hits': 0,
+    'llm_coalesced': 0,
+    'llm_seconds': 0.0,
+    'llm_prompt_tokens': 0,
+    'llm_completion_tokens': 0,
+    'llm_queue_waits': 0,
+    'llm_queue_wait_seconds': 0.0,
+    'llm_queue_depth': 0
+}
+_totals_lock = threading.Lock()
+
+def _record_totals(summary):
+    with _totals_lock:
+        _totals['runs'] += 1
+        _totals['run_seconds'] += summary['total_seconds']
+        for name, stage in summary['stages'].items():
+            _totals['stage_seconds'][name] = _totals['stage_seconds'].get(name, 0.0) + stage['seconds']
+        _totals['llm_calls'] += summary['llm']['calls']
+        _totals['llm_cache_hits'] += summary['llm']['cache_hits']
+        _totals['llm_coalesced'] += summary['llm']['coalesced']
+        _totals['llm_seconds'] += summary['llm']['seconds']
+        _totals['llm_prompt_tokens'] += summary['llm']['prompt_tokens']
+        _totals['llm_completion_tokens'] += summary['llm']['completion_tokens']
+        text = _prometheus_text()
+
+    if METRICS_FILE:
+        try:
+            # Write atomically so a scraper never reads a partial file
+            temp_path = f"{METRICS_FILE}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(temp_path, METRICS_FILE)
+        except OSError as e:
+            logger.warning(f"Could not write metrics file: {e}")
+
+def record_queue_wait(seconds):
+    """
+    Add the time one LLM call waited for a scheduler slot to the process-wide totals
+
+    Args:
+        seconds (float): Seconds waited
+    """
+    with _totals_lock:
+        _totals['llm_queue_waits'] += 1
+        _totals['llm_queue_wait_seconds'] += seconds
+
+def set_queue_depth(depth):
+    """
+    Set the number of LLM calls currently waiting for a scheduler slot
+
+    Args:
+        depth (int): Calls waiting
+    """
+    with _totals_lock:
+        _totals['llm_queue_depth'] = depth
+
+def _prometheus_text():
+    lines = [
+        "# TYPE timesheet_runs_total counter",
+        f"timesheet_runs_total {_totals['runs']}",
+        "# TYPE timesheet_run_seconds_total counter",
+        f"timesheet_run_seconds_total {_totals['run_seconds']:.6f}",
+        "# TYPE timesheet_stage_seconds_total counter"
+    ]
+    for name, seconds in sorted(_totals['stage_seconds'].items()):
+        lines.append(f'timesheet_stage_seconds_total{{stage="{name}"}} {seconds:.6f}')
+    lines += [
+        "# TYPE timesheet_llm_calls_total counter",
+        f"timesheet_llm_calls_total {_totals['llm_calls']}",
+        "# TYPE timesheet_llm_cache_hits_total counter",
+        f"timesheet_llm_cache_hits_total {_totals['llm_cache_hits']}",
+        "# TYPE timesheet_llm_coalesced_total counter",
+        f"timesheet_llm_coalesced_total {_totals['llm_coalesced']}",
+        "# TYPE timesheet_llm_seconds_total counter",
+        f"timesheet_llm_seconds_total {_totals['llm_seconds']:.6f}",
+        "# TYPE timesheet_llm_tokens_total counter",
+        f'timesheet_llm_tokens_total{{kind="prompt"}} {_totals["llm_prompt_tokens"]}',
+        f'timesheet_llm_tokens_total{{kind="completion"}} {_totals["llm_completion_tokens"]}',
+        "# TYPE timesheet_llm_queue_waits_total counter",
+        f"timesheet_llm_queue_waits_total {_totals['llm_queue_waits']}",
+        "# TYPE timesheet_llm_queue_wait_seconds_total counter",
+        f"timesheet_llm_queue_wait_seconds_total {_totals['llm_queue_wait_seconds']:.6f}",
+        "# TYPE timesheet_llm_queue_depth gauge",
+        f"timesheet_llm_queue_depth {_totals['llm_queue_depth']}"
+    ]
+    return "\n".join(lines) + "\n"
+
+def get_prometheus_metrics():
+    """
+    Get the process-wide metrics in Prometheus text exposition format
+
+    Returns:
+        str: Metrics text
+    """
+    with _totals_lock:
+        return _prometheus_text()
@@ -0,0 +1,101 @@
+import cProfile
+import marshal
+import pstats
+import threading
+from contextlib import contextmanager
+
+_local = threading.local()
+
+class GenerationProfiler:
+    """
+    Collects cProfile data from every thread working on one generation
+
+    cProfile only sees the thread it is enabled in, so the generating thread and
+    each LLM worker task profile themselves and the results are merged into one
+    .prof file, readable with `python -m pstats`, snakeviz or any pstats viewer.
+    From Python 3.12, cProfile allows one active profile per process, which sees
+    every thread; the threads that cannot start their own are then covered by it.
+    """
+
+    def __init__(self):
+        self._profiles = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def profile(self):
+        """
+        Profile the current thread for the duration of a block
+
+        While the block runs this is the thread's current profiler, so work it hands
+        to other threads can be profiled too with wrap(). If another profile is already
+        active in the process (Python 3.12+), the block runs without one.
+        """
+        if getattr(_local, 'profiler', None) is not None:
+            # Already profiled; a second cProfile would replace the first one's hook
+            yield self
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # "Another profiling tool is already active": that profile records this thread
+            yield self
+            return
+        _local.profiler = self
+        try:
+            yield self
+        finally:
+            profile.disable()
+            _local.profiler = None
+            with self._lock:
+                self._profiles.append(profile)
+
+    def wrap(self, func):
+        """
+        Wrap a function so calls to it are profiled in whichever thread runs them
+
+        Args:
+            func (callable): Function to profile, e.g. a task submitted to an executor
+
+        Returns:
+            callable: The wrapped function
+        """
+        def profiled(*args, **kwargs):
+            with self.profile():
+                return func(*args, **kwargs)
+        return profiled
+
+    def dump(self):
+        """
+        Merge the profiles collected so far
+
+        Returns:
+            bytes: Profile in the .prof format written by pstats.Stats.dump_stats
+        """
+        with self._lock:
+            profiles = list(self._profiles)
+        if not profiles:
+            return b""
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return marshal.dumps(stats.stats)
+
+    def save(self, path):
+        """
+        Write the merged profile to a .prof file
+
+        Args:
+            path (str): Output path
+        """
+        with open(path, "wb") as f:
+            f.write(self.dump())
+
+def get_current_profiler():
+    """
+    Get the profiler the current thread is profiled by
+
+    Returns:
+        GenerationProfiler or None: Profiler of the enclosing GenerationProfiler.profile() block, if any
+    """
+    return getattr(_local, 'profiler', None)
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import time
+from contextlib import nullcontext
+import streamlit as st
+from prompts.task_summarization import TASK_SUMMARIZATION_TEMPLATE
+from services.job_service import add_session_job, get_job_manager, get_session_id
+from services.holiday_service import get_session_calendar
+from services.scheduler_service import set_current_session
+from config.settings import LLM_MODEL, LLM_MODELS, LLM_CHUNKING, SESSION_RESULTS_MAX, GENERATION_DEADLINE_SECONDS
+
+def compute_fingerprint(employee_info, date_range, descriptions_text, holidays, work_hours, profile=False):
+    """
+    Compute a fingerprint of every input that affects a generated timesheet
+
+    Args:
+        employee_info (dict): Employee information dictionary
+        date_range (tuple): Tuple containing start_date and end_date
+        descriptions_text (str): Text from the descriptions text area
+        holidays (list): Holiday objects within the date range
+        work_hours (dict): Work hours dictionary
+        profile (bool): Whether the generation is profiled, since the result then includes the profile
+
+    Returns:
+        str: Hex digest identifying the inputs
+    """
+    inputs = {
+        'employee_info': employee_info,
+        'date_range': [d.isoformat() for d in date_range],
+        'descriptions': descriptions_text,
+        'holidays': [holiday.to_dict() for holiday in holidays],
+        'work_hours': work_hours,
+        'model': LLM_MODEL,
+        'models': LLM_MODELS,
+        'chunking': LLM_CHUNKING,
+        'prompt': TASK_SUMMARIZATION_TEMPLATE,
+        'profile': profile
+    }
+    encoded = json.dumps(inputs, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+def get_result(fingerprint):
+    """
+    Get the result generated in this session for a fingerprint
+
+    Args:
+        fingerprint (str): Fingerprint from compute_fingerprint
+
+    Returns:
+        dict or None: Stored result with 'workbook' bytes and 'preview' rows, or None
+    """
+    results = st.session_state.results
+    result = results.pop(fingerprint, None)
+    if result is not None:
+        results[fingerprint] = result  # Mark as most recently used
+    return result
+
+def submit_timesheet_job(employee_info, date_range, descriptions_text, dates, fingerprint, profile=False):
+    """
+    Queue generation of an Excel timesheet on the background job pool
+
+    The session's holiday calendar, work hours and previous summaries are captured
+    now, since the job runs outside the script run.
+
+    Args:
+        employee_info (dict): Employee information dictionary
+        date_range (tuple): Tuple containing start_date and end_date
+        descriptions_text (str): Text from the descriptions text area
+        dates (list): List of dates within the range
+        fingerprint (str): Fingerprint of the inputs, from compute_fingerprint
+        profile (bool): Profile the generation with cProfile
+
+    Returns:
+        Job: The queued job. Its result is a dictionary with 'workbook' bytes, 'preview'
+            rows, the download 'file_name', the updated 'summary_store', the run 'metrics'
+            the number of 'late_rows' that missed GENERATION_DEADLINE_SECONDS and, when
+            profiling, the 'profile' as .prof bytes (else None). When
+            there are late rows, 'upgrade_job' is a follow-up job that finishes their
+            summaries and builds the upgraded workbook.
+    """
+    holidays = get_session_calendar(st.session_state.holidays)
+    work_hours = dict(st.session_state.work_hours)
+    summary_store = dict(st.session_state.summary_store)
+
+    def run(job, deadline_seconds=GENERATION_DEADLINE_SECONDS):
+        # Imported here so page loads and reruns do not pay for openpyxl and langchain
+        from services.excel_service import build_timesheet
+        from services.metrics_service import RunMetrics
+        from services.profiling_service import GenerationProfiler
+
+        # Queue this job's LLM calls under the submitting session until the job is cancelled
+        set_current_session(job.owner, lambda: job.cancelled)
+        metrics = RunMetrics()
+        deadline = time.monotonic() + deadline_seconds if deadline_seconds else None
+        late_rows = []
+        profiler = GenerationProfiler() if profile else None
+        with profiler.profile() if profiler else nullcontext():
+            output, preview_data = build_timesheet(
+                employee_info,
+                date_range,
+                descriptions_text,
+                dates,
+                holidays,
+                work_hours,
+                job.report_progress,
+                metrics,
+                summary_store,
+                job.update_row,
+                deadline,
+                late_rows
+            )
+        result = {
+            'workbook': output.getvalue(),
+            'preview': preview_data,
+            'file_name': file_name,
+            'summary_store': summary_store,
+            'metrics': metrics.finish(employee_id=employee_info['employee_id']),
+            'late_rows': len(late_rows),
+            'profile': profiler.dump() if profiler else None
+        }
+        if late_rows:
+            # Summaries still in flight land in the summary cache; rebuild without a deadline to pick them up
+            result['upgrade_job'] = get_job_manager().submit(
+                lambda upgrade: run(upgrade, None), f"{label} (upgraded)", key=job.key, owner=job.owner
+            )
+        return result
+
+    start_date, end_date = date_range
+    file_name = (f"timesheet_{employee_info['name'].replace(' ', '_')}_"
+                 f"{start_date.strftime('%Y%m%d')}-{end_date.strftime('%Y%m%d')}.xlsx")
+    label = f"{employee_info['name']}, {start_date.strftime('%d %b %Y')} - {end_date.strftime('%d %b %Y')}"
+    return get_job_manager().submit(run, label, key=fingerprint, owner=get_session_id())
+
+def collect_job_results(jobs):
+    """
+    Store the results of finished background timesheet jobs in this session
+
+    Args:
+        jobs (list): Jobs from submit_timesheet_job; unfinished and already collected jobs are skipped.
+            Follow-up upgrade jobs are added to this tab's jobs.
+    """
+    collected = st.session_state.collected_jobs
+    for job in jobs:
+        if job.status != "done" or job.id in collected:
+            continue
+        store_result(job.key, job.result['workbook'], job.result['preview'], job.result['late_rows'],
+                     job.result['profile'])
+        if 'upgrade_job' in job.result:
+            add_session_job(job.result['upgrade_job'])
+        st.session_state.summary_store.update(job.result['summary_store'])
+        st.session_state.last_run_metrics = job.result['metrics']
+        collected.add(job.id)
+
+def store_result(fingerprint, workbook, preview_data, late_rows=0, profile=None):
+    """
+    Store a generated timesheet for reuse on later reruns
+
+    Only the SESSION_RESULTS_MAX most recently used results are kept.
+
+    Args:
+        fingerprint (str): Fingerprint from compute_fingerprint
+        workbook (bytes): Generated Excel file
+        preview_data (list): Preview data dictionaries
+        late_rows (int): Number of days that got an extractive summary after missing the deadline
+        profile (bytes, optional): cProfile data of the generation in .prof format
+
+    Returns:
+        dict: The stored result
+    """
+    results = st.session_state.results
+    results.pop(fingerprint, None)
+    results[fingerprint] = {
+        'workbook': workbook,
+        'preview': preview_data,
+        'late_rows': late_rows,
+        'profile': profile
+    }
+    while len(results) > SESSION_RESULTS_MAX:
+        results.pop(next(iter(results)))
+    return results[fingerprint]
@@ -0,0 +1,160 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from services.metrics_service import record_queue_wait, set_queue_depth
+from utils.resources import shared_resource
+from config.settings import LLM_GLOBAL_CONCURRENCY
+
+_local = threading.local()
+
+# Seconds between checks of whether a queued call has been cancelled
+WAIT_STEP_SECONDS = 0.2
+
+class CallCancelled(Exception):
+    """Raised when an LLM call is cancelled while it waits for a scheduler slot"""
+
+def set_current_session(session, cancelled=None):
+    """
+    Set the session that LLM calls made from this thread are queued under
+
+    Args:
+        session (str): Session id, e.g. the owner of a background job
+        cancelled (callable, optional): Returns True once the calls are no longer
+            wanted, e.g. when the job is cancelled; queued calls then give up
+    """
+    _local.session = session
+    _local.cancelled = cancelled
+
+def get_current_session():
+    """
+    Get the session that LLM calls made from this thread are queued under
+
+    Returns:
+        str: Session set with set_current_session, else 'default'
+    """
+    return getattr(_local, 'session', None) or "default"
+
+def get_current_cancelled():
+    """
+    Get the cancellation check for LLM calls made from this thread
+
+    Returns:
+        callable or None: Check set with set_current_session
+    """
+    return getattr(_local, 'cancelled', None)
+
+class FairScheduler:
+    """
+    Process-wide cap on concurrent LLM calls with round-robin queuing across sessions
+
+    When every slot is busy, calls wait in a queue per session. A freed slot goes
+    to the first waiting call of the next session in turn, so a session with a
+    year of descriptions queued cannot starve one with a single week.
+    """
+
+    def __init__(self, max_concurrency):
+        self.max_concurrency = max(1, max_concurrency)
+        self.active = 0
+        self._queues = OrderedDict()  # Session -> deque of waiting events, in turn order
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self, session, cancelled=None):
+        """
+        Hold one of the concurrency slots for the duration of a block
+
+        Args:
+            session (str): Session the call is made for
+            cancelled (callable, optional): Checked while waiting; once it returns
+                True the call leaves the queue and CallCancelled is raised
+
+        Yields:
+            float: Seconds spent waiting for the slot
+        """
+        start = time.perf_counter()
+        event = None
+        with self._lock:
+            if self.active < self.max_concurrency and not self._queues:
+                self.active += 1
+            else:
+                event = threading.Event()
+                self._queues.setdefault(session, deque()).append(event)
+                set_queue_depth(self._waiting())
+        if event is not None:
+            while not event.wait(WAIT_STEP_SECONDS):
+                if cancelled is not None and cancelled():
+                    self._withdraw(session, event)
+                    raise CallCancelled(f"LLM call for session {session} cancelled while queued")
+
+        waited = time.perf_counter() - start
+        record_queue_wait(waited)
+        try:
+            yield waited
+        finally:
+            self._release()
+
+    def _release(self):
+        with self._lock:
+            if not self._queues:
+                self.active -= 1
+                return
+            # Hand the slot to the session whose turn it is and move it to the back
+            session, queue = self._queues.popitem(last=False)
+            event = queue.popleft()
+            if queue:
+                self._queues[session] = queue
+            set_queue_depth(self._waiting())
+            event.set()
+
+    def _withdraw(self, session, event):
+        with self._lock:
+            queue = self._queues.get(session)
+            if queue is not None and event in queue:
+                queue.remove(event)
+                if not queue:
+                    del self._queues[session]
+                set_queue_depth(self._waiting())
+                return
+        # The slot was handed over just as the call gave up; pass it on
+        self._release()
+
+    def _waiting(self):
+        return sum(len(queue) for queue in self._queues.values())
+
+    def position(self, session):
+        """
+        Get where a session's next call stands in the queue
+
+        Args:
+            session (str): Session id
+
+        Returns:
+            tuple or None: (1-based position of the session's next call, number of the
+                session's calls waiting), or None if the session has nothing queued
+        """
+        with self._lock:
+            for position, (queued_session, queue) in enumerate(self._queues.items(), start=1):
+                if queued_session == session:
+                    return position, len(queue)
+        return None
+
+    def stats(self):
+        """
+        Get the current load
+
+        Returns:
+            dict: Slots in use ('active'), calls waiting ('waiting') and sessions waiting ('sessions')
+        """
+        with self._lock:
+            return {'active': self.active, 'waiting': self._waiting(), 'sessions': len(self._queues)}
+
+@shared_resource
+def get_llm_scheduler():
+    """
+    Get the LLM scheduler shared by every session
+
+    Returns:
+        FairScheduler: Scheduler allowing LLM_GLOBAL_CONCURRENCY calls at once
+    """
+    return FairScheduler(LLM_GLOBAL_CONCURRENCY)
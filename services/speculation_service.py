@@ -0,0 +1,117 @@
+import hashlib
+import threading
+import streamlit as st
+from utils.helpers import parse_descriptions
+from services.job_service import JobManager, get_session_id
+from services.scheduler_service import set_current_session
+from config.settings import SPECULATION, LLM_CONTEXTUAL
+
+@st.cache_resource
+def get_speculation_manager():
+    """
+    Get the job manager for speculative summarization, separate from generation jobs
+
+    Returns:
+        JobManager: Manager with SPECULATION['workers'] worker threads
+    """
+    return JobManager(SPECULATION['workers'], expiry_seconds=60)
+
+class PendingSpeculation:
+    """
+    A speculative summarization that is submitted once its debounce delay has passed
+
+    The delay runs on a timer thread rather than in a speculation worker, so a
+    burst of edits does not fill the workers with attempts that are only waiting
+    to be cancelled.
+    """
+
+    def __init__(self, digest, manager, run, owner, delay):
+        self.digest = digest
+        self.job_id = None
+        self._manager = manager
+        self._cancelled = False
+        self._lock = threading.Lock()
+        self._timer = threading.Timer(delay, self._submit, args=(run, owner))
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _submit(self, run, owner):
+        with self._lock:
+            if not self._cancelled:
+                self.job_id = self._manager.submit(run, "Speculative summarization", owner=owner).id
+
+    def cancel(self):
+        """Drop the attempt if it has not been submitted yet, else cancel its job"""
+        with self._lock:
+            self._cancelled = True
+            self._timer.cancel()
+            if self.job_id is not None:
+                self._manager.cancel(self.job_id)
+
+def speculate(descriptions_text, dates, holidays, work_hours):
+    """
+    Summarize edited working-day descriptions in the background before Generate is clicked
+
+    Runs whenever the descriptions change. Any previous attempt for this session is
+    cancelled, and the new one is only submitted once SPECULATION['debounce_seconds']
+    have passed without another edit, so nothing is sent while the text keeps changing. At most
+    SPECULATION['max_descriptions'] new or changed descriptions are summarized, one
+    at a time and queued separately in the shared scheduler so they take turns
+    with generation jobs.
+    Summaries only land in the shared summary cache, where generation picks them
+    up; a summary still in flight when Generate is clicked is shared with the
+    generation job. The session's summary store is left to generation, which
+    marks the days it re-summarized, and is never touched from the background.
+
+    Args:
+        descriptions_text (str): Text from the descriptions text area
+        dates (list): List of dates within the range
+        holidays (list): Holiday objects within the date range
+        work_hours (dict): Work hours dictionary
+    """
+    if not SPECULATION['enabled'] or LLM_CONTEXTUAL or not dates:
+        return
+
+    digest = hashlib.sha256(f"{dates[0]}|{dates[-1]}|{descriptions_text}".encode("utf-8")).hexdigest()
+    previous = st.session_state.get('speculation')
+    if previous and previous.digest == digest:
+        return
+    cancel_speculation()
+
+    # The job runs outside the script run, so capture a copy of session state now
+    summary_store = dict(st.session_state.summary_store)
+    owner = f"{get_session_id()}:speculative"
+    holiday_dict = {holiday.date: holiday.name for holiday in holidays}
+    work_hours = dict(work_hours)
+
+    def run(job):
+        # Imported here so speculation does not slow down page loads
+        from services.cache_service import get_summary_cache
+        from services.excel_service import classify_date
+        from services.llm_service import iter_summaries
+
+        if get_summary_cache() is None:
+            return 0  # Nowhere to keep the summaries for generation
+        set_current_session(owner, lambda: job.cancelled)
+        pending = {}
+        for date, description in parse_descriptions(descriptions_text, dates).items():
+            _, _, summarize = classify_date(date, description, holiday_dict.get(date), work_hours)
+            stored = summary_store.get(date)
+            if summarize and (stored is None or stored[0] != description):
+                pending[date] = description
+                if len(pending) >= SPECULATION['max_descriptions']:
+                    break
+
+        for completed, _ in enumerate(iter_summaries(pending, max_workers=1), start=1):
+            job.report_progress(completed / len(pending), f"Summarized {completed}/{len(pending)} tasks")
+        return len(pending)
+
+    st.session_state.speculation = PendingSpeculation(
+        digest, get_speculation_manager(), run, owner, SPECULATION['debounce_seconds']
+    )
+
+def cancel_speculation():
+    """Cancel this session's speculative summarization, if any is pending or running"""
+    previous = st.session_state.get('speculation')
+    if previous:
+        previous.cancel()
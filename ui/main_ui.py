@@ -1,7 +1,10 @@
 import streamlit as st
 from datetime import datetime, timedelta, date
-from config.settings import DEFAULT_EMPLOYEE_INFO
-from utils.helpers import generate_date_range
+from config.settings import DEFAULT_EMPLOYEE_INFO, JOB_SETTINGS
+from utils.helpers import generate_date_range, parse_descriptions_report
+from services.holiday_service import get_session_calendar
+from services.job_service import get_job_manager
+from services.scheduler_service import get_llm_scheduler
 
 def render_main_ui():
     """
@@ -79,6 +82,10 @@ def render_main_ui():
         5 Thu: Holiday - Labor Day
         ```
         
+        For ranges spanning several months the day can also be written as a full
+        date (`2025-03-05:`) or with its month (`5 Mar:`). The weekday in `5 Wed:`
+        is used to pick the right month when the same day number appears twice.
+        
         Descriptions starting with "Leave", "Holiday", or "Weekend" will be marked accordingly.
         For days without descriptions, weekends will be auto-detected.
         """)
@@ -91,11 +98,7 @@ def render_main_ui():
         current_date += timedelta(days=1)
 
     # Check if any predefined holidays fall within the date range
-    holiday_dict = {}
-    for holiday in st.session_state.holidays:
-        holiday_date = datetime.strptime(holiday['date'], '%Y-%m-%d').date()
-        if start_date <= holiday_date <= end_date:
-            holiday_dict[holiday_date] = holiday['name']
+    holiday_dict = {holiday.date: holiday.name for holiday in get_session_calendar(st.session_state.holidays).between(start_date, end_date)}
 
     # Generate default text for text area with day and day name
     default_text = []
@@ -114,20 +117,34 @@ def render_main_ui():
     help="Enter one line per day in the format 'day day_name: description'. Use 'Leave' for leave days, 'Holiday' for holidays, or enter your work description."
 )
     
+    # Report lines that could not be placed on a date
+    _, unmatched, duplicates = parse_descriptions_report(descriptions_text, dates)
+    if unmatched:
+        st.warning("These lines do not match any date in the selected range and will be ignored:\n\n" +
+                   "\n".join(f"- `{line.strip()}`" for line in unmatched))
+    if duplicates:
+        st.warning("These dates are described more than once; the last description will be used: " +
+                   ", ".join(d.strftime('%d %b %Y') for d in duplicates))
+    
     return employee_info, (start_date, end_date), descriptions_text, dates
 
-def render_preview(preview_df):
+def render_preview(preview_data):
     """
     Render the preview of the generated timesheet
     
     Args:
-        preview_df (pandas.DataFrame): Dataframe containing preview data
+        preview_data (list): Preview data dictionaries with Date, Day, Status and Task keys
     """
     st.subheader("Timesheet Preview")
     
-    if preview_df.empty:
+    if not preview_data:
         st.info("Generate a timesheet to see the preview here")
     else:
+        # Imported on demand so the first page load does not pay for pandas
+        import pandas as pd
+        
+        preview_df = pd.DataFrame(preview_data)
+        
         # Apply custom styling to the dataframe
         def highlight_status(val):
             """Apply background color based on status value"""
@@ -144,17 +161,137 @@ def render_preview(preview_df):
         styled_df = preview_df.style.applymap(highlight_status, subset=['Status'])
         st.dataframe(styled_df, use_container_width=True)
         
+        # Report how many rows were re-summarized in an incremental regeneration
+        if 'Updated' in preview_df:
+            updated = int((preview_df['Updated'] != "").sum())
+            st.caption(f"{updated} day(s) re-summarized (marked ✓ in the Updated column); "
+                       "the rest reused the previous run's summaries")
+        
         # Display summary statistics
-        st.subheader("Summary")
-        total_days = len(preview_df)
-        working_days = len(preview_df[preview_df['Status'] == 'Regular Day'])
-        holidays = len(preview_df[preview_df['Status'].str.contains('Holiday')])
-        leave_days = len(preview_df[preview_df['Status'].str.contains('Leave')])
-        weekends = len(preview_df[preview_df['Status'] == 'Weekend'])
+        render_summary(list(preview_df['Status']))
+
+def render_summary(statuses):
+    """
+    Render the day counts of a timesheet
+    
+    Args:
+        statuses (list): Status value of every row
+    """
+    st.subheader("Summary")
+    col1, col2, col3, col4, col5 = st.columns(5)
+    col1.metric("Total Days", len(statuses))
+    col2.metric("Working Days", sum(1 for status in statuses if status == 'Regular Day'))
+    col3.metric("Holidays", sum(1 for status in statuses if 'Holiday' in status))
+    col4.metric("Leave Days", sum(1 for status in statuses if 'Leave' in status))
+    col5.metric("Weekends", sum(1 for status in statuses if status == 'Weekend'))
+
+def render_live_preview(rows):
+    """
+    Render the preview of a timesheet that is still being generated
+    
+    Args:
+        rows (list): (row_data, pending) pairs in row order, from Job.snapshot_rows
+    """
+    st.subheader("Timesheet Preview")
+    preview_data = []
+    for row_data, pending in rows:
+        task = row_data[6]
+        if pending:
+            task = f"{task} …" if task else "…"
+        preview_data.append({
+            "Date": row_data[0],
+            "Day": row_data[1],
+            "Status": row_data[2],
+            "Task": task if task else "N/A"
+        })
+    if preview_data:
+        st.dataframe(preview_data, use_container_width=True)
+        render_summary([row["Status"] for row in preview_data])
+
+def render_jobs(jobs, fingerprint):
+    """
+    Render the background generation jobs of this tab
+    
+    While a job is queued or running the panel refreshes itself every
+    poll interval, showing the live preview of the job for the current inputs.
+    
+    Args:
+        jobs (list): Jobs from get_session_jobs
+        fingerprint (str or None): Fingerprint of the current inputs, whose job's live
+            preview is shown (None to show no live preview)
+    """
+    if any(job.active for job in jobs):
+        _render_jobs_live([job.id for job in jobs], fingerprint)
+    elif jobs:
+        _render_job_list(jobs)
+
+@st.fragment(run_every=JOB_SETTINGS['poll_interval'])
+def _render_jobs_live(job_ids, fingerprint):
+    manager = get_job_manager()
+    jobs = [job for job in (manager.get(job_id) for job_id in job_ids) if job is not None]
+    _render_job_list(jobs)
+    
+    current = next((job for job in jobs if job.key == fingerprint and job.active), None)
+    if current is not None:
+        render_live_preview(current.snapshot_rows())
+    
+    if not any(job.active for job in jobs):
+        st.rerun()  # Rerun the whole page so finished results are picked up
+
+def _render_job_list(jobs):
+    with st.expander("Jobs", expanded=any(job.active for job in jobs)):
+        manager = get_job_manager()
+        for job in reversed(jobs):
+            col1, col2 = st.columns([5, 1])
+            col1.markdown(f"**{job.label}**: {job.message}")
+            if job.active:
+                col1.progress(job.progress)
+                queued = get_llm_scheduler().position(job.owner)
+                if queued:
+                    col1.caption(f"Waiting for the shared LLM: position {queued[0]} in the queue, "
+                                 f"{queued[1]} request(s) of yours waiting")
+                col2.button("Cancel", key=f"cancel_{job.id}", on_click=manager.cancel, args=(job.id,))
+            elif job.status == "done":
+                col2.download_button(
+                    label="Download",
+                    data=job.result['workbook'],
+                    file_name=job.result['file_name'],
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    key=f"download_{job.id}"
+                )
+
+def render_performance(run_metrics):
+    """
+    Render the per-stage timing breakdown of the last generation
+    
+    Args:
+        run_metrics (dict): Run summary from RunMetrics.finish
+    """
+    with st.expander("Performance"):
+        st.write(f"Total time: {run_metrics['total_seconds']:.2f} s")
+        if run_metrics.get('first_row_seconds') is not None:
+            st.write(f"First summarized row: {run_metrics['first_row_seconds']:.2f} s")
         
+        stages = [
+            {"Stage": name, "Seconds": round(stage['seconds'], 3), "Count": stage['count']}
+            for name, stage in run_metrics['stages'].items()
+        ]
+        if stages:
+            st.dataframe(stages, use_container_width=True, hide_index=True)
+        
+        llm = run_metrics['llm']
         col1, col2, col3, col4, col5 = st.columns(5)
-        col1.metric("Total Days", total_days)
-        col2.metric("Working Days", working_days)
-        col3.metric("Holidays", holidays)
-        col4.metric("Leave Days", leave_days)
-        col5.metric("Weekends", weekends)
\ No newline at end of file
+        col1.metric("LLM Calls", llm['calls'])
+        col2.metric("Cache Hits", llm['cache_hits'])
+        col3.metric("Coalesced", llm['coalesced'], help="Calls saved by sharing the result of an identical request")
+        col4.metric("LLM Time (s)", f"{llm['seconds']:.2f}")
+        col5.metric("Tokens (prompt / output)", f"{llm['prompt_tokens']} / {llm['completion_tokens']}")
+        
+        if llm.get('models'):
+            st.caption("Models: " + ", ".join(
+                f"{name} ({model['calls']} calls, {model['seconds'] / model['calls']:.2f} s avg)"
+                for name, model in llm['models'].items()
+            ))
+        if llm.get('chunked', {}).get('descriptions'):
+            st.caption(f"Long descriptions: {llm['chunked']['descriptions']} summarized in "
+                       f"{llm['chunked']['chunks']} chunks")
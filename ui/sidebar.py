@@ -1,5 +1,7 @@
 import streamlit as st
 from datetime import datetime
+from models.timesheet import Holiday
+from services.holiday_service import get_holiday_calendar, get_holiday_calendar_error
 
 def render_sidebar():
     """
@@ -13,6 +15,9 @@ def render_sidebar():
         
         # Holiday management
         render_holiday_section()
+        
+        # Profiling of generation runs
+        render_diagnostics_section()
 
 def render_work_hours_section():
     """
@@ -40,20 +45,36 @@ def render_holiday_section():
     
     if st.button("Add Holiday"):
         if holiday_date and holiday_name:
-            new_holiday = {
-                'date': holiday_date.strftime('%Y-%m-%d'),
-                'name': holiday_name
-            }
+            new_holiday = Holiday(holiday_date, holiday_name)
             if new_holiday not in st.session_state.holidays:
                 st.session_state.holidays.append(new_holiday)
                 st.success(f"Added holiday: {holiday_name} on {holiday_date}")
     
+    # Organization holidays are loaded from the shared calendar files
+    organization_holidays = len(get_holiday_calendar())
+    calendar_error = get_holiday_calendar_error()
+    if calendar_error:
+        st.warning(f"Error loading holiday calendars: {calendar_error}")
+    if organization_holidays:
+        st.caption(f"{organization_holidays} organization holidays loaded from the shared calendar")
+    
     # Display current holidays
     if st.session_state.holidays:
         st.subheader("Defined Holidays")
         for i, holiday in enumerate(st.session_state.holidays):
-            st.write(f"{i+1}. {holiday['name']} ({holiday['date']})")
+            st.write(f"{i+1}. {holiday.name} ({holiday.date.strftime('%Y-%m-%d')})")
             
         if st.button("Clear All Holidays"):
             st.session_state.holidays = []
-            st.success("All holidays cleared")
\ No newline at end of file
+            st.success("All holidays cleared")
+
+def render_diagnostics_section():
+    """
+    Render the diagnostics section in the sidebar
+    """
+    st.subheader("Diagnostics")
+    st.session_state.profile_generation = st.checkbox(
+        "Profile generation",
+        value=st.session_state.profile_generation,
+        help="Record where Python time goes during generation and offer the cProfile .prof file for download"
+    )
@@ -1,4 +1,18 @@
+import re
 from datetime import datetime, timedelta
+from functools import lru_cache
+
+# Weekday and month names in calendar order, for parsing description prefixes
+WEEKDAY_NAMES = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+MONTH_NAMES = [
+    'january', 'february', 'march', 'april', 'may', 'june',
+    'july', 'august', 'september', 'october', 'november', 'december'
+]
+
+# Words and individual punctuation marks, the units count_tokens estimates from
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+# Boundaries a long description is split at: sentence ends and line breaks
+CHUNK_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n+")
 
 def ordinal_suffix(day):
     """
@@ -21,6 +35,108 @@ def ordinal_suffix(day):
     else:
         return "th"
 
+def normalize_description(description):
+    """
+    Normalize a task description for comparison and caching
+    
+    Args:
+        description (str): Raw task description
+        
+    Returns:
+        str: Lower-cased description with collapsed whitespace
+    """
+    return " ".join(description.split()).lower()
+
+def extractive_summary(description, max_words=30):
+    """
+    Build a quick summary from the description itself, without the LLM
+    
+    Whole sentences are kept from the start of the description while they fit
+    in max_words; a first sentence that is already too long is cut at max_words.
+    
+    Args:
+        description (str): Raw task description
+        max_words (int): Maximum number of words in the summary
+        
+    Returns:
+        str: Capitalized summary ending with a period
+    """
+    sentences = [s for s in re.split(r"(?<=[.!?])\s+", " ".join(description.split())) if s]
+    words = []
+    for sentence in sentences:
+        sentence_words = sentence.split()
+        if words and len(words) + len(sentence_words) > max_words:
+            break
+        words.extend(sentence_words)
+    words = words[:max_words]
+    if not words:
+        return ""
+    summary = " ".join(words).rstrip(" ,;:-.!?")
+    return summary[:1].upper() + summary[1:] + "."
+
+@lru_cache(maxsize=4096)
+def count_tokens(text):
+    """
+    Estimate the number of model tokens in a text without calling the model
+    
+    Each word counts as one token plus one for every further six characters, and
+    each punctuation mark as one token, which errs on the high side of what the
+    Llama tokenizers produce for English text. Results are cached, since the same
+    descriptions are counted again on every rerun.
+    
+    Args:
+        text (str): Text to count
+        
+    Returns:
+        int: Estimated token count
+    """
+    return sum(1 + (len(piece) - 1) // 6 for piece in TOKEN_PATTERN.findall(text))
+
+def split_into_chunks(text, max_tokens):
+    """
+    Split a long text into chunks of at most max_tokens estimated tokens
+    
+    Chunks are cut at sentence ends and line breaks; a single sentence that is
+    too long on its own is cut between words. No text is dropped.
+    
+    Args:
+        text (str): Text to split
+        max_tokens (int): Maximum estimated tokens per chunk
+        
+    Returns:
+        list: Chunks in their original order
+    """
+    max_tokens = max(1, max_tokens)
+    pieces = []
+    for sentence in CHUNK_BOUNDARY.split(text):
+        sentence = " ".join(sentence.split())
+        if not sentence:
+            continue
+        if count_tokens(sentence) <= max_tokens:
+            pieces.append(sentence)
+            continue
+        words, size = [], 0
+        for word in sentence.split():
+            tokens = count_tokens(word)
+            if words and size + tokens > max_tokens:
+                pieces.append(" ".join(words))
+                words, size = [], 0
+            words.append(word)
+            size += tokens
+        pieces.append(" ".join(words))
+    
+    chunks, current, size = [], [], 0
+    for piece in pieces:
+        tokens = count_tokens(piece)
+        if current and size + tokens > max_tokens:
+            chunks.append(" ".join(current))
+            current, size = [], 0
+        current.append(piece)
+        size += tokens
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
 def generate_date_range(start_date, end_date):
     """
     Generate a list of dates between start_date and end_date, inclusive
@@ -39,6 +155,123 @@ def generate_date_range(start_date, end_date):
         current_date += timedelta(days=1)
     return dates
 
+def _match_name(name, names):
+    """
+    Find the calendar name that a word abbreviates (at least three letters)
+    
+    Args:
+        name (str): Word from a description prefix, e.g. 'Wed' or 'March'
+        names (list): Full names in calendar order
+        
+    Returns:
+        int or None: Index of the matching name, or None if there is no match
+    """
+    name = name.lower()
+    if len(name) >= 3:
+        for i, full_name in enumerate(names):
+            if full_name.startswith(name):
+                return i
+    return None
+
+def _resolve_prefix(prefix, dates_by_day, date_set):
+    """
+    Resolve a line prefix such as '2025-03-05', '5 Wed', '5 Mar' or '5 Mar 2025' to candidate dates
+    
+    Args:
+        prefix (str): Text before the first colon of a description line
+        dates_by_day (dict): Dates in the range indexed by day of month
+        date_set (set): All dates in the range
+        
+    Returns:
+        list: Candidate dates in chronological order (empty if the prefix does not match)
+    """
+    parts = prefix.replace(",", " ").split()
+    if not parts:
+        return []
+    
+    # Full ISO date
+    if len(parts) == 1 and "-" in parts[0]:
+        try:
+            date = datetime.strptime(parts[0], '%Y-%m-%d').date()
+        except ValueError:
+            return []
+        return [date] if date in date_set else []
+    
+    try:
+        day = int(parts[0])
+    except ValueError:
+        return []
+    
+    # Narrow down by any weekday, month or year that follows the day
+    candidates = dates_by_day.get(day, [])
+    for part in parts[1:]:
+        weekday = _match_name(part, WEEKDAY_NAMES)
+        month = _match_name(part, MONTH_NAMES)
+        if weekday is not None:
+            candidates = [d for d in candidates if d.weekday() == weekday]
+        elif month is not None:
+            candidates = [d for d in candidates if d.month == month + 1]
+        elif part.isdigit() and len(part) == 4:
+            candidates = [d for d in candidates if d.year == int(part)]
+        else:
+            return []
+    return candidates
+
+def parse_descriptions_report(descriptions_text, dates):
+    """
+    Parse text area input into descriptions, reporting lines that could not be placed
+    
+    Each line is 'prefix: description', where the prefix is a full date
+    ('2025-03-05'), a day with a weekday ('5 Wed'), a day with a month
+    ('5 Mar', optionally followed by a year) or a bare day ('5'). When a prefix
+    matches more than one date in the range, the first match after the
+    previously placed line is used, so chronologically ordered input spanning
+    several months maps to the right rows.
+    
+    Args:
+        descriptions_text (str): Text from the descriptions text area
+        dates (list): List of dates
+        
+    Returns:
+        tuple: (dict mapping date objects to description strings,
+                list of unmatched lines, list of dates described more than once)
+    """
+    # Index the range once so each line is resolved without scanning every date
+    dates_by_day = {}
+    for date in dates:
+        dates_by_day.setdefault(date.day, []).append(date)
+    date_set = set(dates)
+    
+    date_to_desc = {}
+    unmatched = []
+    duplicates = []
+    last_date = None
+    
+    for line in descriptions_text.split("\n"):
+        if not line.strip():
+            continue
+        if ":" not in line:
+            unmatched.append(line)
+            continue
+        
+        prefix, desc = line.split(":", 1)
+        candidates = _resolve_prefix(prefix, dates_by_day, date_set)
+        if not candidates:
+            unmatched.append(line)
+            continue
+        
+        # Prefer the first candidate after the previously placed line
+        date = candidates[0]
+        if last_date is not None:
+            date = next((d for d in candidates if d > last_date), date)
+        
+        if date in date_to_desc and date not in duplicates:
+            duplicates.append(date)
+        date_to_desc[date] = desc.strip()
+        last_date = date
+    
+    return date_to_desc, unmatched, duplicates
+
 def parse_descriptions(descriptions_text, dates):
     """
     Parse text area input into a dictionary mapping dates to descriptions
@@ -50,22 +283,5 @@ def parse_descriptions(descriptions_text, dates):
     Returns:
         dict: Dictionary mapping date objects to description strings
     """
-    date_to_desc = {}
-    lines = descriptions_text.split("\n")
-    
-    for line in lines:
-        if ":" in line:
-            prefix, desc = line.split(":", 1)
-            parts = prefix.strip().split()
-            if len(parts) >= 1:
-                try:
-                    day = int(parts[0])
-                    # Find the corresponding date
-                    for date in dates:
-                        if date.day == day:
-                            date_to_desc[date] = desc.strip()
-                            break
-                except ValueError:
-                    continue  # Skip invalid lines
-    
-    return date_to_desc
\ No newline at end of file
+    date_to_desc, _, _ = parse_descriptions_report(descriptions_text, dates)
+    return date_to_desc
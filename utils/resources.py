@@ -0,0 +1,45 @@
+import functools
+import threading
+from collections import OrderedDict
+
+def shared_resource(func=None, max_entries=None):
+    """
+    Cache a function's result per arguments for the whole process
+
+    The engine's counterpart of st.cache_resource: every caller, in any thread or
+    session, gets the same object, and no Streamlit runtime is needed, so the
+    CLI and background jobs use the same singletons as the app. The value is
+    created at most once per arguments, even when several threads ask at once.
+
+    Args:
+        func (callable): Function creating the resource; its arguments must be hashable
+        max_entries (int, optional): Keep only this many results, least recently used first
+
+    Returns:
+        callable: The cached function, with a clear() method to drop every result
+    """
+    if func is None:
+        return lambda f: shared_resource(f, max_entries)
+
+    cache = OrderedDict()
+    lock = threading.RLock()
+
+    @functools.wraps(func)
+    def cached(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        with lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+            value = func(*args, **kwargs)
+            cache[key] = value
+            if max_entries and len(cache) > max_entries:
+                cache.popitem(last=False)
+            return value
+
+    def clear():
+        with lock:
+            cache.clear()
+
+    cached.clear = clear
+    return cached